@@ -0,0 +1,88 @@
+import heapq
+import itertools
+
+
+class AdminRoster:
+    """Vedligeholdt liste over admins og deres antal åbne permanente opgave sessioner.
+
+    Admins ligger i en min-heap efter belastning. Når en belastning ændrer
+    sig pushes en ny entry og den gamle bliver forældet (lazy deletion), så
+    både tildeling og opdatering er O(log n). Admins der har meldt fravær
+    eller ikke er tilgængelige lige nu springes over uden at miste pladsen.
+    """
+
+    def __init__(self):
+        self._load = {}        # admin_id -> antal åbne sessioner
+        self._version = {}     # admin_id -> version af den gyldige heap entry
+        self._heap = []        # (belastning, rækkefølge, admin_id, version)
+        self._sequence = itertools.count()
+        self._sessions = {}    # channel_id -> admin_id
+        self._opted_out = set()
+
+    def set_admins(self, admin_ids):
+        """Synkroniser listen med de nuværende admins - sessioner tælles med"""
+        admin_ids = set(admin_ids)
+        for admin_id in set(self._load) - admin_ids:
+            del self._load[admin_id]  # Versionen beholdes så gamle heap entries forbliver forældede
+        for admin_id in admin_ids - set(self._load):
+            self._load[admin_id] = sum(1 for owner in self._sessions.values() if owner == admin_id)
+            self._push(admin_id)
+
+    def load_sessions(self, sessions):
+        """Indlæs gemte [(channel_id, admin_id)] sessioner ved opstart"""
+        self._sessions = dict(sessions)
+        for admin_id in self._load:
+            self._load[admin_id] = sum(1 for owner in self._sessions.values() if owner == admin_id)
+            self._push(admin_id)
+
+    def set_opted_out(self, admin_ids):
+        self._opted_out = set(admin_ids)
+
+    def is_opted_out(self, admin_id):
+        return admin_id in self._opted_out
+
+    def load(self, admin_id):
+        return self._load.get(admin_id, 0)
+
+    def pick(self, available=lambda admin_id: True):
+        """Mindst belastede tilgængelige admin uden fravær, eller None"""
+        skipped = []
+        chosen = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            admin_id, version = entry[2], entry[3]
+            if admin_id not in self._load or self._version.get(admin_id) != version:
+                continue  # Forældet entry
+            skipped.append(entry)
+            if admin_id not in self._opted_out and available(admin_id):
+                chosen = admin_id
+                break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return chosen
+
+    def start_session(self, channel_id, admin_id):
+        self._sessions[channel_id] = admin_id
+        if admin_id in self._load:
+            self._load[admin_id] += 1
+            self._push(admin_id)
+
+    def end_session(self, channel_id):
+        """Afslut sessionen for en kanal - returnerer admin ID eller None hvis kanalen ikke var en session"""
+        admin_id = self._sessions.pop(channel_id, None)
+        if admin_id in self._load:
+            self._load[admin_id] = max(0, self._load[admin_id] - 1)
+            self._push(admin_id)
+        return admin_id
+
+    def _push(self, admin_id):
+        version = self._version.get(admin_id, 0) + 1
+        self._version[admin_id] = version
+        heapq.heappush(self._heap, (self._load[admin_id], next(self._sequence), admin_id, version))
+        if len(self._heap) > 4 * len(self._load) + 16:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap
+                      if entry[2] in self._load and self._version.get(entry[2]) == entry[3]]
+        heapq.heapify(self._heap)
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+import discord
+
+
+def section_hash(section):
+    """Stabil hash af en sektions indhold (embed timestamp ignoreres)"""
+    embed = section.get("embed")
+    embed_data = embed.to_dict() if embed else None
+    if embed_data:
+        embed_data.pop("timestamp", None)
+    view = section.get("view")
+    components = [item.to_component_dict() for item in view.children] if view else []
+    payload = json.dumps({"content": section.get("content"), "embed": embed_data, "components": components},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class BoardRenderer:
+    """Renderer en kanal som en fast rækkefølge af sektioner, én besked per sektion.
+
+    Besked IDs og indholds-hash for hver sektion gemmes i settings tabellen.
+    Ved hver render redigeres kun de sektioner hvis hash har ændret sig, og
+    beskeder sendes eller slettes kun når antallet af sektioner ændrer sig.
+    Sendte beskeder registreres i bot besked indekset med settings_key som formål.
+    """
+
+    def __init__(self, db, settings_key):
+        self.db = db
+        self.settings_key = settings_key
+        self._state = None
+
+    async def load_state(self):
+        if self._state is None:
+            try:
+                self._state = json.loads(await self.db.get_setting(self.settings_key, "[]"))
+            except ValueError:
+                self._state = []
+        return list(self._state)
+
+    async def save_state(self, state):
+        self._state = list(state)
+        await self.db.set_setting(self.settings_key, json.dumps(state))
+
+    async def reset(self):
+        await self.save_state([])
+
+    async def render(self, kanal, sections):
+        """Bring kanalen i overensstemmelse med sections og returner antal API kald"""
+        state = await self.load_state()
+        new_state = []
+        api_calls = 0
+
+        for i, section in enumerate(sections):
+            digest = section_hash(section)
+            payload = {"content": section.get("content"), "embed": section.get("embed"), "view": section.get("view")}
+
+            if i < len(state):
+                entry = state[i]
+                if entry["hash"] == digest:
+                    new_state.append(entry)
+                    continue
+                try:
+                    await kanal.get_partial_message(entry["id"]).edit(**payload)
+                    api_calls += 1
+                    new_state.append({"id": entry["id"], "hash": digest})
+                    continue
+                except discord.NotFound:
+                    # Beskeden er slettet udefra - rækkefølgen kan ikke længere garanteres,
+                    # så kalderen må rydde kanalen og rendere forfra
+                    raise
+
+            message = await kanal.send(**payload)
+            api_calls += 1
+            new_state.append({"id": message.id, "hash": digest})
+            await self.db.track_bot_messages([(message.id, kanal.id)], self.settings_key)
+
+        # Fjern overskydende sektioner
+        removed = []
+        for entry in state[len(sections):]:
+            try:
+                await kanal.get_partial_message(entry["id"]).delete()
+                api_calls += 1
+            except discord.NotFound:
+                pass
+            removed.append(entry["id"])
+        if removed:
+            await self.db.forget_tracked_messages(removed)
+
+        if new_state != state:
+            await self.save_state(new_state)
+        return api_calls
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import discord
+
+POOL_KANAL_PREFIX = "ledig-kanal"
+
+
+class ChannelPool:
+    """Lille varm pulje af skjulte, forud oprettede kanaler i den private kategori.
+
+    Ved et claim omdøbes en kanal fra puljen og får medlemmernes overwrites i
+    ét enkelt edit kald, i stedet for at vente på create_text_channel. Puljen
+    fyldes op igen i baggrunden og skrumper af sig selv når den ikke bruges.
+    Kanaler med POOL_KANAL_PREFIX i kategorien adopteres igen efter genstart.
+    """
+
+    def __init__(self, bot, category_id, size=2, min_size=0, idle_timeout=1800, check_interval=60):
+        self.bot = bot
+        self.category_id = category_id
+        self.size = size
+        self.min_size = min_size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self._channels = []
+        self._refill_task = None
+        self._maintenance_task = None
+        self._last_used = time.monotonic()
+        self.stats = {"hits": 0, "misses": 0, "created": 0, "shrunk": 0}
+
+    def category(self):
+        return self.bot.get_channel(self.category_id)
+
+    def start(self):
+        """Adopter eksisterende pulje kanaler og start opfyldning og tomgangs oprydning"""
+        kategori = self.category()
+        if kategori is not None:
+            known = {channel.id for channel in self._channels}
+            self._channels.extend(channel for channel in kategori.text_channels
+                                  if channel.name.startswith(POOL_KANAL_PREFIX) and channel.id not in known)
+        self.refill()
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    @property
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def __len__(self):
+        return len(self._channels)
+
+    async def acquire(self, name, overwrites):
+        """Giv en kanal med det angivne navn og overwrites - fra puljen hvis muligt"""
+        self._last_used = time.monotonic()
+        try:
+            while self._channels:
+                channel = self._channels.pop()
+                try:
+                    await channel.edit(name=name, overwrites=overwrites)
+                    self.stats["hits"] += 1
+                    return channel
+                except discord.NotFound:
+                    continue  # Slettet udefra - prøv næste
+                except discord.HTTPException:
+                    # Kanalen er urørt (stadig skjult) - læg den tilbage så den ikke går tabt
+                    self._channels.append(channel)
+                    raise
+
+            self.stats["misses"] += 1
+            kategori = self.category()
+            if kategori is None:
+                raise RuntimeError("Kunne ikke finde kategorien til private kanaler")
+            return await kategori.create_text_channel(name=name, overwrites=overwrites)
+        finally:
+            self.refill()
+
+    def refill(self):
+        """Fyld puljen op i baggrunden hvis den ikke allerede er i gang"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self):
+        while len(self._channels) < self.size:
+            kategori = self.category()
+            if kategori is None:
+                return
+            try:
+                channel = await kategori.create_text_channel(
+                    name=f"{POOL_KANAL_PREFIX}-{self.stats['created'] + 1}",
+                    overwrites={kategori.guild.default_role: discord.PermissionOverwrite(read_messages=False)}
+                )
+            except discord.HTTPException as e:
+                print(f"⚠️ Kunne ikke fylde kanal puljen op: {e}")
+                return
+            self._channels.append(channel)
+            self.stats["created"] += 1
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            idle = time.monotonic() - self._last_used
+            if idle < self.idle_timeout or len(self._channels) <= self.min_size:
+                continue
+            if self._refill_task is not None and not self._refill_task.done():
+                continue
+
+            # Skrump én kanal per check så puljen langsomt glider ned mod min_size
+            channel = self._channels.pop(0)
+            try:
+                await channel.delete()
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                self._channels.append(channel)
+                print(f"⚠️ Kunne ikke skrumpe kanal puljen: {e}")
+                continue
+            self.stats["shrunk"] += 1
+
+    def format_stats(self):
+        return (f"Kanal pulje: {len(self._channels)}/{self.size} klar, {self.stats['hits']} hits, "
+                f"{self.stats['misses']} misses ({self.hit_rate:.0%}), "
+                f"{self.stats['created']} oprettet, {self.stats['shrunk']} skrumpet")
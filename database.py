@@ -0,0 +1,659 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import migrations
+
+MEMBER_JOB_COLUMNS = (
+    "id", "titel", "beskrivelse", "belonning", "point_reward", "oprettet_af", "oprettet_navn",
+    "status", "prospect_supporter_id", "prospect_supporter_navn", "privat_kanal_id", "oprettet_tid",
+    "taget_tid", "job_number", "kontrol_panel_id"
+)
+
+COMPLETED_JOB_COLUMNS = (
+    "id", "titel", "beskrivelse", "belonning", "point_reward", "oprettet_af", "oprettet_navn",
+    "prospect_supporter_id", "prospect_supporter_navn", "completed_tid", "job_number"
+)
+
+
+def _member_job_from_row(row):
+    return dict(zip(MEMBER_JOB_COLUMNS, row))
+
+
+def _add_to_point_buckets(conn, rows):
+    """Læg [(prospect_supporter_id, points)] til dagens bucket - kaldes i samme transaktion som point eventet"""
+    conn.executemany("""
+        INSERT INTO point_buckets (dag, prospect_supporter_id, points)
+        VALUES (date('now', 'localtime'), ?, ?)
+        ON CONFLICT(dag, prospect_supporter_id) DO UPDATE SET points = points + excluded.points
+    """, rows)
+
+
+class Database:
+    """Async adgang til SQLite - én vedvarende WAL forbindelse på en dedikeret tråd.
+
+    Alle forespørgsler køres på den samme executor tråd, så event loopet aldrig
+    blokeres af disk I/O, og skrivninger er automatisk serialiserede.
+    """
+
+    def __init__(self, path, default_permanent_jobs=()):
+        self.path = path
+        self.default_permanent_jobs = list(default_permanent_jobs)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn = None
+
+    def _connection(self):
+        # Kaldes kun fra executor tråden
+        if self._conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    async def run(self, fn, *args):
+        """Kør fn(conn, *args) på database tråden og returner resultatet"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self._connection(), *args))
+
+    async def close(self):
+        def _close(conn):
+            conn.close()
+            self._conn = None
+        if self._conn is not None:
+            await self.run(_close)
+        self._executor.shutdown(wait=False)
+
+    async def init(self):
+        """Initialize SQLite database"""
+        def _init(conn):
+            cursor = conn.cursor()
+
+            applied = migrations.migrate(conn)
+            cursor = conn.cursor()
+
+            # Insert default permanent jobs if none exist
+            cursor.execute("SELECT COUNT(*) FROM permanent_jobs")
+            if cursor.fetchone()[0] == 0:
+                for job in self.default_permanent_jobs:
+                    cursor.execute("INSERT OR IGNORE INTO permanent_jobs (job_text) VALUES (?)", (job,))
+
+            # Initialize job counter if not exists
+            cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('job_counter', '1')")
+
+            conn.commit()
+            migrations.check_query_plans(conn)
+            return applied
+
+        try:
+            applied = await self.run(_init)
+            if applied:
+                print(f"🗄️ Database migreret til version {applied[-1]} (anvendt: {', '.join(map(str, applied))})")
+            print("✅ Database initialized successfully")
+        except migrations.QueryPlanError as e:
+            # Et manglende indeks skal opdages ved opstart, ikke som langsomme renders senere
+            print(f"❌ Hot query plan check fejlede: {e}")
+            raise
+        except Exception as e:
+            # En fejlet migration må ikke efterlade botten kørende på et halvt skema
+            print(f"❌ Fejl ved database initialisering: {e}")
+            raise
+
+    # ---------- Settings ----------
+
+    async def get_setting(self, key, default=None):
+        """Get a value from the settings table"""
+        def _query(conn):
+            row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else default
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af setting {key}: {e}")
+            return default
+
+    async def set_setting(self, key, value):
+        """Store a value in the settings table"""
+        def _query(conn):
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, str(value)))
+        try:
+            await self.run(_query)
+            return True
+        except Exception as e:
+            print(f"Fejl ved gemning af setting {key}: {e}")
+            return False
+
+    # ---------- Permanente jobs ----------
+
+    async def get_permanent_jobs(self):
+        """Get all permanent jobs from database"""
+        def _query(conn):
+            cursor = conn.execute("SELECT job_text FROM permanent_jobs ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af permanente jobs: {e}")
+            return list(self.default_permanent_jobs)
+
+    async def add_permanent_job(self, job_text):
+        """Add permanent job to database"""
+        def _query(conn):
+            with conn:
+                conn.execute("INSERT INTO permanent_jobs (job_text) VALUES (?)", (job_text,))
+            return True
+        try:
+            return await self.run(_query)
+        except sqlite3.IntegrityError:
+            return False  # Job already exists
+        except Exception as e:
+            print(f"Fejl ved tilføjelse af permanent job: {e}")
+            return False
+
+    async def update_permanent_job(self, old_text, new_text):
+        """Update permanent job in database"""
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("UPDATE permanent_jobs SET job_text = ? WHERE job_text = ?", (new_text, old_text))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved opdatering af permanent job: {e}")
+            return False
+
+    async def remove_permanent_job(self, job_text):
+        """Remove permanent job from database"""
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("DELETE FROM permanent_jobs WHERE job_text = ?", (job_text,))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved fjernelse af permanent job: {e}")
+            return False
+
+    # ---------- Permanente opgave sessioner ----------
+
+    async def get_permanent_sessions(self):
+        """Alle åbne sessioner som [(channel_id, admin_id)]"""
+        def _query(conn):
+            return conn.execute("SELECT channel_id, admin_id FROM permanent_sessions").fetchall()
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af permanente sessioner: {e}")
+            return []
+
+    async def add_permanent_session(self, channel_id, admin_id, prospect_supporter_id, job_number):
+        def _query(conn):
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO permanent_sessions (channel_id, admin_id, prospect_supporter_id, job_number)
+                    VALUES (?, ?, ?, ?)
+                """, (channel_id, admin_id, prospect_supporter_id, job_number))
+            return True
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved gemning af permanent session: {e}")
+            return False
+
+    async def remove_permanent_session(self, channel_id):
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("DELETE FROM permanent_sessions WHERE channel_id = ?", (channel_id,))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved fjernelse af permanent session: {e}")
+            return False
+
+    # ---------- Medlems jobs ----------
+
+    async def get_member_jobs(self):
+        """Get all member jobs from database"""
+        def _query(conn):
+            cursor = conn.execute(f"""
+                SELECT {', '.join(MEMBER_JOB_COLUMNS)}
+                FROM member_jobs
+                ORDER BY job_number
+            """)
+            return [_member_job_from_row(row) for row in cursor.fetchall()]
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af medlem jobs: {e}")
+            return []
+
+    async def add_member_job(self, job_data):
+        """Add member job to database - tildeler id og job nummer atomisk og returnerer jobbet"""
+        def _query(conn):
+            with conn:
+                # Get next job number
+                cursor = conn.execute("SELECT value FROM settings WHERE key = 'job_counter'")
+                job_counter = int(cursor.fetchone()[0])
+                job = dict(job_data, id=f"job_{job_counter}")
+
+                conn.execute("""
+                    INSERT INTO member_jobs
+                    (id, titel, beskrivelse, belonning, point_reward, oprettet_af, oprettet_navn, job_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    job["id"], job["titel"], job["beskrivelse"],
+                    job["belonning"], job.get("point_reward", 0),
+                    job["oprettet_af"], job["oprettet_navn"],
+                    job_counter
+                ))
+
+                # Update job counter
+                conn.execute("UPDATE settings SET value = ? WHERE key = 'job_counter'", (str(job_counter + 1),))
+
+                # Returner rækken som gemt, så defaults (status, oprettet_tid) er med
+                row = conn.execute(f"SELECT {', '.join(MEMBER_JOB_COLUMNS)} FROM member_jobs WHERE id = ?", (job["id"],)).fetchone()
+            return _member_job_from_row(row)
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved tilføjelse af medlem job: {e}")
+            return None
+
+    async def update_member_job_status(self, job_id, status, prospect_supporter_id=None, prospect_supporter_navn=None):
+        """Update member job status in database"""
+        def _query(conn):
+            with conn:
+                if prospect_supporter_id and prospect_supporter_navn:
+                    cursor = conn.execute("""
+                        UPDATE member_jobs
+                        SET status = ?, prospect_supporter_id = ?, prospect_supporter_navn = ?, taget_tid = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    """, (status, prospect_supporter_id, prospect_supporter_navn, job_id))
+                else:
+                    cursor = conn.execute("UPDATE member_jobs SET status = ? WHERE id = ?", (status, job_id))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved opdatering af job status: {e}")
+            return False
+
+    async def claim_member_job(self, job_id, prospect_supporter_id, prospect_supporter_navn):
+        """Tag et job atomisk - lykkes kun hvis jobbet stadig er ledigt.
+        Returnerer True (vundet), False (allerede taget) eller None ved fejl"""
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("""
+                    UPDATE member_jobs
+                    SET status = 'optaget', prospect_supporter_id = ?, prospect_supporter_navn = ?, taget_tid = CURRENT_TIMESTAMP,
+                        privat_kanal_id = NULL, kontrol_panel_id = NULL
+                    WHERE id = ? AND status = 'ledig'
+                """, (prospect_supporter_id, prospect_supporter_navn, job_id))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved claim af job: {e}")
+            return None
+
+    async def update_private_channel_id(self, job_id, channel_id):
+        """Update private channel ID for a job"""
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("UPDATE member_jobs SET privat_kanal_id = ? WHERE id = ?", (channel_id, job_id))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved opdatering af kanal ID: {e}")
+            return False
+
+    async def update_control_panel_id(self, job_id, message_id):
+        """Update control panel message ID for a job"""
+        def _query(conn):
+            with conn:
+                cursor = conn.execute("UPDATE member_jobs SET kontrol_panel_id = ? WHERE id = ?", (message_id, job_id))
+            return cursor.rowcount > 0
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved opdatering af kontrol panel ID: {e}")
+            return False
+
+    async def complete_member_job_with_points(self, job_id, point_reward):
+        """Complete a member job and update stats with specified point reward"""
+        def _query(conn):
+            with conn:
+                # Get job data
+                cursor = conn.execute("SELECT * FROM member_jobs WHERE id = ?", (job_id,))
+                job_row = cursor.fetchone()
+                if not job_row:
+                    return False
+
+                # Move to completed_jobs
+                conn.execute("""
+                    INSERT INTO completed_jobs
+                    (id, titel, beskrivelse, belonning, point_reward, oprettet_af, oprettet_navn,
+                     prospect_supporter_id, prospect_supporter_navn, job_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (job_row[0], job_row[1], job_row[2], job_row[3], point_reward, job_row[5],
+                      job_row[6], job_row[8], job_row[9], job_row[13]))
+
+                # Skriv pointene i ledgeren i samme transaktion - snapshot opdateres af compactoren
+                if job_row[8] is not None:
+                    conn.execute("""
+                        INSERT INTO point_events
+                        (prospect_supporter_id, prospect_supporter_navn, points, kilde, job_id, tildelt_af)
+                        VALUES (?, ?, ?, 'job', ?, ?)
+                    """, (job_row[8], job_row[9], point_reward, job_row[0], job_row[5]))
+                    _add_to_point_buckets(conn, [(job_row[8], point_reward)])
+
+                # Remove from member_jobs
+                conn.execute("DELETE FROM member_jobs WHERE id = ?", (job_id,))
+            return True
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved færdiggørelse af job: {e}")
+            return False
+
+    async def delete_member_job_by_id(self, job_id):
+        """Delete a member job by ID and return its private channel ID if exists"""
+        def _query(conn):
+            with conn:
+                # Get job info before deleting
+                row = conn.execute("SELECT privat_kanal_id FROM member_jobs WHERE id = ?", (job_id,)).fetchone()
+                privat_kanal_id = row[0] if row else None
+
+                # Delete the job
+                cursor = conn.execute("DELETE FROM member_jobs WHERE id = ?", (job_id,))
+            return cursor.rowcount > 0, privat_kanal_id
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved sletning af job: {e}")
+            return False, None
+
+    async def reset_jobs_and_stats(self):
+        """Clear all tables except permanent_jobs and reset the job counter"""
+        def _query(conn):
+            with conn:
+                conn.execute("DELETE FROM member_jobs")
+                conn.execute("DELETE FROM completed_jobs")
+                conn.execute("DELETE FROM prospect_supporter_stats")
+                conn.execute("DELETE FROM point_events")
+                conn.execute("DELETE FROM point_buckets")
+                conn.execute("UPDATE settings SET value = '1' WHERE key = 'job_counter'")
+                conn.execute("""
+                    UPDATE settings SET value = (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'point_events')
+                    WHERE key = 'point_events_compacted_id'
+                """)
+        await self.run(_query)
+
+    # ---------- Prospect/Supporter stats ----------
+
+    async def append_point_events(self, events):
+        """Tilføj en batch af point events til ledgeren i én transaktion.
+        events er [(prospect_supporter_id, navn, points, kilde, job_id, tildelt_af)]"""
+        def _query(conn):
+            with conn:
+                conn.executemany("""
+                    INSERT INTO point_events
+                    (prospect_supporter_id, prospect_supporter_navn, points, kilde, job_id, tildelt_af)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, events)
+                _add_to_point_buckets(conn, [(event[0], event[2]) for event in events])
+            return True
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved skrivning af point events: {e}")
+            return False
+
+    async def compact_point_events(self):
+        """Fold nye point events ind i prospect_supporter_stats - returnerer (events, members)"""
+        def _query(conn):
+            with conn:
+                row = conn.execute("SELECT value FROM settings WHERE key = 'point_events_compacted_id'").fetchone()
+                last_id = int(row[0]) if row else 0
+                sums = conn.execute("""
+                    SELECT prospect_supporter_id, SUM(points), MAX(id), COUNT(*)
+                    FROM point_events NOT INDEXED WHERE id > ?
+                    GROUP BY prospect_supporter_id
+                """, (last_id,)).fetchall()
+                if not sums:
+                    return 0, 0
+
+                for member_id, points, max_id, _ in sums:
+                    navn = conn.execute("SELECT prospect_supporter_navn FROM point_events WHERE id = ?",
+                                        (max_id,)).fetchone()[0] or "Ukendt"
+                    conn.execute("""
+                        INSERT INTO prospect_supporter_stats (prospect_supporter_id, prospect_supporter_navn, total_points)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(prospect_supporter_id) DO UPDATE SET
+                            total_points = total_points + excluded.total_points,
+                            prospect_supporter_navn = excluded.prospect_supporter_navn,
+                            last_updated = CURRENT_TIMESTAMP
+                    """, (member_id, navn, points))
+
+                new_last_id = max(max_id for _, _, max_id, _ in sums)
+                conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('point_events_compacted_id', ?)",
+                             (str(new_last_id),))
+            return sum(count for *_, count in sums), len(sums)
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved komprimering af point events: {e}")
+            return 0, 0
+
+    async def replay_point_totals(self, until=None):
+        """Genskab pointsummer ud fra ledgeren alene, evt. som de var på et tidspunkt ('YYYY-MM-DD HH:MM:SS' UTC)"""
+        def _query(conn):
+            if until is None:
+                cursor = conn.execute("""
+                    SELECT prospect_supporter_id, SUM(points) FROM point_events GROUP BY prospect_supporter_id
+                """)
+            else:
+                cursor = conn.execute("""
+                    SELECT prospect_supporter_id, SUM(points) FROM point_events
+                    WHERE oprettet_tid <= ? GROUP BY prospect_supporter_id
+                """, (until,))
+            return dict(cursor.fetchall())
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved genafspilning af point ledger: {e}")
+            return {}
+
+    async def get_point_buckets(self, since):
+        """[(dag, prospect_supporter_id, points)] for alle dage fra og med since ('YYYY-MM-DD')"""
+        def _query(conn):
+            return conn.execute("""
+                SELECT dag, prospect_supporter_id, points FROM point_buckets WHERE dag >= ?
+            """, (since,)).fetchall()
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af point buckets: {e}")
+            return []
+
+    async def get_prospect_supporter_stats(self, member_ids=None):
+        """Get prospect_supporter statistics from database, evt. kun for de givne member IDs"""
+        def _query(conn):
+            if member_ids is None:
+                cursor = conn.execute("""
+                    SELECT prospect_supporter_id, prospect_supporter_navn, total_points
+                    FROM prospect_supporter_stats
+                    ORDER BY total_points DESC
+                """)
+                return cursor.fetchall()
+            ids = list(member_ids)
+            if not ids:
+                return []
+            placeholders = ','.join(['?' for _ in ids])
+            cursor = conn.execute(f"""
+                SELECT prospect_supporter_id, prospect_supporter_navn, total_points
+                FROM prospect_supporter_stats
+                WHERE prospect_supporter_id IN ({placeholders})
+                ORDER BY total_points DESC
+            """, ids)
+            return cursor.fetchall()
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af prospect_supporter stats: {e}")
+            return []
+
+    async def get_recent_completed_jobs(self, member_ids=None, limit=5):
+        """Get recent completed jobs from database, evt. kun for de givne member IDs"""
+        def _query(conn):
+            if member_ids is None:
+                cursor = conn.execute("""
+                    SELECT titel, prospect_supporter_navn, completed_tid, job_number
+                    FROM completed_jobs
+                    ORDER BY completed_tid DESC
+                    LIMIT ?
+                """, (limit,))
+                return cursor.fetchall()
+            ids = list(member_ids)
+            if not ids:
+                return []
+            placeholders = ','.join(['?' for _ in ids])
+            cursor = conn.execute(f"""
+                SELECT titel, prospect_supporter_navn, completed_tid, job_number
+                FROM completed_jobs
+                WHERE prospect_supporter_id IN ({placeholders})
+                ORDER BY completed_tid DESC
+                LIMIT ?
+            """, ids + [limit])
+            return cursor.fetchall()
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af seneste jobs: {e}")
+            return []
+
+    async def get_completed_jobs_older_than(self, days, limit=500):
+        """De ældste færdige jobs der er mere end days dage gamle, som dicts - til arkivering"""
+        def _query(conn):
+            cursor = conn.execute(f"""
+                SELECT {', '.join(COMPLETED_JOB_COLUMNS)} FROM completed_jobs
+                WHERE completed_tid < datetime('now', ?)
+                ORDER BY completed_tid
+                LIMIT ?
+            """, (f"-{int(days)} days", limit))
+            return [dict(zip(COMPLETED_JOB_COLUMNS, row)) for row in cursor.fetchall()]
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af gamle færdige jobs: {e}")
+            return []
+
+    async def delete_completed_jobs(self, job_ids):
+        """Slet færdige jobs (efter de er skrevet til arkivet) - returnerer antal slettede"""
+        def _query(conn):
+            with conn:
+                cursor = conn.executemany("DELETE FROM completed_jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+            return cursor.rowcount
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved sletning af arkiverede jobs: {e}")
+            return 0
+
+    async def search_completed_jobs(self, term, limit=15):
+        """Søg i de færdige jobs der endnu ikke er arkiveret - nyeste først"""
+        def _query(conn):
+            pattern = f"%{term}%"
+            number = int(term.lstrip("#")) if term.lstrip("#").isdigit() else None
+            cursor = conn.execute(f"""
+                SELECT {', '.join(COMPLETED_JOB_COLUMNS)} FROM completed_jobs
+                WHERE job_number = ? OR titel LIKE ? OR beskrivelse LIKE ?
+                   OR prospect_supporter_navn LIKE ? OR oprettet_navn LIKE ?
+                ORDER BY completed_tid DESC
+                LIMIT ?
+            """, (number, pattern, pattern, pattern, pattern, limit))
+            return [dict(zip(COMPLETED_JOB_COLUMNS, row)) for row in cursor.fetchall()]
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved søgning i færdige jobs: {e}")
+            return []
+
+    async def sync_prospect_supporter_members(self, members):
+        """Sørg for at alle (id, navn) par er i statistik tabellen og opdater deres navne"""
+        def _query(conn):
+            with conn:
+                # Indsæt alle aktuelle members i tabellen hvis de ikke allerede er der
+                conn.executemany("""
+                    INSERT OR IGNORE INTO prospect_supporter_stats (prospect_supporter_id, prospect_supporter_navn, total_points)
+                    VALUES (?, ?, 0)
+                """, members)
+
+                # Opdater navne for eksisterende members - last_updated følger kun point ændringer
+                conn.executemany("""
+                    UPDATE prospect_supporter_stats
+                    SET prospect_supporter_navn = ?
+                    WHERE prospect_supporter_id = ? AND prospect_supporter_navn != ?
+                """, [(navn, member_id, navn) for member_id, navn in members])
+        await self.run(_query)
+
+    # ---------- Bot besked indeks ----------
+
+    async def track_bot_messages(self, messages, purpose=None):
+        """Registrer [(message_id, channel_id)] - et kendt formål overskriver 'ukendt'"""
+        def _query(conn):
+            with conn:
+                if purpose is None:
+                    conn.executemany("INSERT OR IGNORE INTO bot_messages (message_id, channel_id) VALUES (?, ?)",
+                                     messages)
+                else:
+                    conn.executemany("""
+                        INSERT INTO bot_messages (message_id, channel_id, purpose) VALUES (?, ?, ?)
+                        ON CONFLICT(message_id) DO UPDATE SET purpose = excluded.purpose
+                    """, [(message_id, channel_id, purpose) for message_id, channel_id in messages])
+        try:
+            await self.run(_query)
+            return True
+        except Exception as e:
+            print(f"Fejl ved registrering af bot beskeder: {e}")
+            return False
+
+    async def get_tracked_messages(self, channel_id, purpose=None):
+        """Besked IDs botten har sendt i en kanal, evt. kun for ét formål"""
+        def _query(conn):
+            if purpose is None:
+                cursor = conn.execute("SELECT message_id FROM bot_messages WHERE channel_id = ? ORDER BY message_id",
+                                      (channel_id,))
+            else:
+                cursor = conn.execute("""
+                    SELECT message_id FROM bot_messages WHERE channel_id = ? AND purpose = ? ORDER BY message_id
+                """, (channel_id, purpose))
+            return [row[0] for row in cursor.fetchall()]
+        try:
+            return await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved hentning af bot beskeder: {e}")
+            return []
+
+    async def forget_tracked_messages(self, message_ids):
+        """Fjern beskeder fra indekset (slettet af os eller udefra)"""
+        def _query(conn):
+            with conn:
+                conn.executemany("DELETE FROM bot_messages WHERE message_id = ?", [(i,) for i in message_ids])
+        try:
+            await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved fjernelse af bot beskeder: {e}")
+
+    async def forget_channel_messages(self, channel_id):
+        """Fjern alle beskeder for en slettet kanal fra indekset"""
+        def _query(conn):
+            with conn:
+                conn.execute("DELETE FROM bot_messages WHERE channel_id = ?", (channel_id,))
+        try:
+            await self.run(_query)
+        except Exception as e:
+            print(f"Fejl ved fjernelse af kanal beskeder: {e}")
@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import json
+import os
+
+SEGMENT_PREFIX = "completed_jobs-"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+class JobArchive:
+    """Kold opbevaring af færdige jobs i komprimerede, append-only segmenter.
+
+    Jobs ældre end max_age_days flyttes fra completed_jobs til ét gzip JSONL
+    segment per måned (completed_jobs-YYYY-MM.jsonl.gz). Et nyt batch
+    tilføjes som et ekstra gzip member, så eksisterende data aldrig skrives
+    om. Rækkerne slettes først fra databasen når segmentet er synket til
+    disk - et nedbrud imellem giver højst en dublet, som søgningen springer over.
+    Dubletter genkendes på (id, completed_tid), da job IDs genbruges efter en
+    nulstilling af systemet mens arkivet bevares.
+    """
+
+    def __init__(self, db, directory, max_age_days=90, batch_size=500, interval=24 * 3600):
+        self.db = db
+        self.directory = directory
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task = None
+        self._lock = asyncio.Lock()
+        self.stats = {"archived": 0, "runs": 0}
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._archive_loop())
+
+    async def archive_old_jobs(self):
+        """Flyt alle jobs ældre end max_age_days til arkivet - returnerer antal flyttede"""
+        async with self._lock:
+            moved = 0
+            while True:
+                jobs = await self.db.get_completed_jobs_older_than(self.max_age_days, self.batch_size)
+                if not jobs:
+                    break
+                await asyncio.to_thread(self._append, jobs)
+                deleted = await self.db.delete_completed_jobs([job["id"] for job in jobs])
+                moved += deleted
+                if deleted < len(jobs):
+                    break  # Sletningen fejlede - prøv igen ved næste kørsel
+            self.stats["archived"] += moved
+            self.stats["runs"] += 1
+            return moved
+
+    def _append(self, jobs):
+        # Kaldes i en tråd - blokerende fil I/O
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = {}
+        for job in jobs:
+            segments.setdefault((job["completed_tid"] or "ukendt")[:7], []).append(job)
+
+        for month, month_jobs in segments.items():
+            with open(self.directory / f"{SEGMENT_PREFIX}{month}{SEGMENT_SUFFIX}", "ab") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="ab") as segment:
+                    for job in month_jobs:
+                        segment.write(json.dumps(job, ensure_ascii=False).encode("utf-8") + b"\n")
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    def segments(self):
+        """Arkiv segmenterne, nyeste måned først"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"), reverse=True)
+
+    async def search(self, term, limit=15, exclude=()):
+        """Søg i arkivet - ét segment læses ad gangen, nyeste måned først, og søgningen
+        stopper ved limit. Inden for et segment sorteres fundene nyeste først, da jobs
+        tilføjes i arkiveringsrækkefølge og ikke efter completed_tid.
+        exclude er (id, completed_tid) nøgler der allerede er fundet andre steder."""
+        return await asyncio.to_thread(self._search, term, limit, set(exclude))
+
+    def _search(self, term, limit, seen):
+        term = term.lower()
+        number = int(term.lstrip("#")) if term.lstrip("#").isdigit() else None
+        matches = []
+        for path in self.segments():
+            segment_matches = []
+            with gzip.open(path, "rt", encoding="utf-8") as segment:
+                for line in segment:
+                    job = json.loads(line)
+                    key = job_key(job)
+                    if key in seen or not _matches(job, term, number):
+                        continue
+                    seen.add(key)
+                    segment_matches.append(job)
+            segment_matches.sort(key=lambda job: job["completed_tid"] or "", reverse=True)
+            matches.extend(segment_matches[:limit - len(matches)])
+            if len(matches) >= limit:
+                return matches
+        return matches
+
+    async def _archive_loop(self):
+        while True:
+            try:
+                moved = await self.archive_old_jobs()
+                if moved:
+                    print(f"🗄️ Arkiverede {moved} færdige jobs ældre end {self.max_age_days} dage")
+            except Exception as e:
+                print(f"Fejl ved arkivering af færdige jobs: {e}")
+            await asyncio.sleep(self.interval)
+
+    def format_stats(self):
+        return (f"Job arkiv: {self.stats['archived']} jobs arkiveret i {self.stats['runs']} kørsler, "
+                f"{len(self.segments())} segmenter")
+
+
+def job_key(job):
+    """Unik nøgle for et færdigt job - id alene genbruges efter en nulstilling"""
+    return job["id"], job["completed_tid"]
+
+
+def _matches(job, term, number):
+    if number is not None and job.get("job_number") == number:
+        return True
+    return any(term in (job.get(field) or "").lower()
+               for field in ("titel", "beskrivelse", "prospect_supporter_navn", "oprettet_navn"))
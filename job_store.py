@@ -0,0 +1,229 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+
+
+def _sqlite_timestamp():
+    # Samme format som SQLite's CURRENT_TIMESTAMP (UTC)
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobStore:
+    """Autoritativ in-memory cache af medlems- og permanente jobs.
+
+    Indlæses én gang ved opstart. Alle ændringer skrives først til databasen
+    og derefter til cachen (write-through), så læsninger til rendering og
+    tilladelsestjek er rene dictionary opslag uden disk I/O.
+    """
+
+    def __init__(self, db, ledger):
+        self.db = db
+        self.ledger = ledger
+        self._jobs = {}                     # id -> job (ordnet efter job_number)
+        self._by_number = {}                # job_number -> id
+        self._by_status = defaultdict(set)  # status -> {id}
+        self._permanent = []
+        self._listeners = []
+        self._points_listeners = []
+        self.loaded = False
+        self.claim_stats = {"attempts": 0, "wins": 0, "conflicts": 0, "errors": 0}
+
+    async def load(self):
+        """Indlæs alle jobs fra databasen og byg indekserne"""
+        member_jobs = await self.db.get_member_jobs()
+        permanent_jobs = await self.db.get_permanent_jobs()
+
+        self._jobs.clear()
+        self._by_number.clear()
+        self._by_status.clear()
+        for job in member_jobs:
+            self._index(job)
+        self._permanent = list(permanent_jobs)
+        self.loaded = True
+        print(f"✅ JobStore indlæst: {len(self._jobs)} medlems jobs, {len(self._permanent)} permanente jobs")
+
+    def add_listener(self, callback):
+        """Registrer callback(job) der kaldes efter hver ændring af et eksisterende medlems job"""
+        self._listeners.append(callback)
+
+    def _notify(self, job):
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"Fejl i JobStore listener: {e}")
+
+    def add_points_listener(self, callback):
+        """Registrer callback(member_id, navn, point) der kaldes efter hver pointtildeling"""
+        self._points_listeners.append(callback)
+
+    def _notify_points(self, member_id, navn, points):
+        for callback in self._points_listeners:
+            try:
+                callback(member_id, navn, points)
+            except Exception as e:
+                print(f"Fejl i JobStore point listener: {e}")
+
+    def _index(self, job):
+        self._jobs[job["id"]] = job
+        if job.get("job_number") is not None:
+            self._by_number[job["job_number"]] = job["id"]
+        self._by_status[job["status"]].add(job["id"])
+
+    def _unindex(self, job_id):
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return None
+        self._by_number.pop(job.get("job_number"), None)
+        self._by_status[job["status"]].discard(job_id)
+        return job
+
+    # ---------- Læsninger ----------
+
+    def get_member_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def get_member_job_by_number(self, job_number):
+        job_id = self._by_number.get(job_number)
+        return self._jobs.get(job_id) if job_id else None
+
+    def member_jobs(self):
+        """Alle medlems jobs sorteret efter job nummer"""
+        return list(self._jobs.values())
+
+    def member_jobs_with_status(self, status):
+        return sorted((self._jobs[job_id] for job_id in self._by_status.get(status, ())),
+                      key=lambda job: job["job_number"] or 0)
+
+    def active_private_channels(self):
+        """(privat_kanal_id, job_id) for alle optagede jobs med en privat kanal"""
+        return [(self._jobs[job_id]["privat_kanal_id"], job_id)
+                for job_id in self._by_status.get("optaget", ())
+                if self._jobs[job_id].get("privat_kanal_id")]
+
+    def permanent_jobs(self):
+        return list(self._permanent)
+
+    def permanent_job(self, job_number):
+        """Permanent job efter 1-indekseret nummer, eller None"""
+        if 1 <= job_number <= len(self._permanent):
+            return self._permanent[job_number - 1]
+        return None
+
+    # ---------- Medlems jobs (write-through) ----------
+
+    async def add_member_job(self, job_data):
+        job = await self.db.add_member_job(job_data)
+        if job:
+            self._index(job)
+        return job
+
+    async def update_member_job_status(self, job_id, status, prospect_supporter_id=None, prospect_supporter_navn=None):
+        if not await self.db.update_member_job_status(job_id, status, prospect_supporter_id, prospect_supporter_navn):
+            return False
+        job = self._jobs.get(job_id)
+        if job:
+            self._by_status[job["status"]].discard(job_id)
+            job["status"] = status
+            if prospect_supporter_id and prospect_supporter_navn:
+                job["prospect_supporter_id"] = prospect_supporter_id
+                job["prospect_supporter_navn"] = prospect_supporter_navn
+                job["taget_tid"] = _sqlite_timestamp()
+            self._by_status[status].add(job_id)
+            self._notify(job)
+        return True
+
+    async def claim_member_job(self, job_id, prospect_supporter_id, prospect_supporter_navn):
+        """Compare-and-swap claim af et ledigt job - returnerer True kun for vinderen"""
+        self.claim_stats["attempts"] += 1
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] != "ledig":
+            # Cachen ved allerede at jobbet er taget - ingen grund til at spørge databasen
+            self.claim_stats["conflicts"] += 1
+            return False
+
+        won = await self.db.claim_member_job(job_id, prospect_supporter_id, prospect_supporter_navn)
+        if won is None:
+            self.claim_stats["errors"] += 1
+            return False
+        if not won:
+            self.claim_stats["conflicts"] += 1
+            return False
+
+        self.claim_stats["wins"] += 1
+        self._by_status[job["status"]].discard(job_id)
+        job["status"] = "optaget"
+        job["prospect_supporter_id"] = prospect_supporter_id
+        job["prospect_supporter_navn"] = prospect_supporter_navn
+        job["taget_tid"] = _sqlite_timestamp()
+        # Et nyt claim får sin egen kanal - glem en tidligere claims (slettede) kanal og panel
+        job["privat_kanal_id"] = None
+        job["kontrol_panel_id"] = None
+        self._by_status["optaget"].add(job_id)
+        self._notify(job)
+        return True
+
+    async def update_private_channel_id(self, job_id, channel_id):
+        if not await self.db.update_private_channel_id(job_id, channel_id):
+            return False
+        if job_id in self._jobs:
+            self._jobs[job_id]["privat_kanal_id"] = channel_id
+        return True
+
+    async def update_control_panel_id(self, job_id, message_id, notify=True):
+        """Gem kontrol panelets besked ID - listeners får besked, da kanal og panel nu er på plads"""
+        if not await self.db.update_control_panel_id(job_id, message_id):
+            return False
+        job = self._jobs.get(job_id)
+        if job:
+            job["kontrol_panel_id"] = message_id
+            if notify:
+                self._notify(job)
+        return True
+
+    async def complete_member_job_with_points(self, job_id, point_reward):
+        if not await self.db.complete_member_job_with_points(job_id, point_reward):
+            return False
+        job = self._unindex(job_id)
+        if job and job.get("prospect_supporter_id"):
+            self._notify_points(job["prospect_supporter_id"], job.get("prospect_supporter_navn"), point_reward)
+        return True
+
+    async def award_points(self, prospect_supporter_id, prospect_supporter_navn, point_reward, tildelt_af=None):
+        """Point uden et medlems job (permanente opgaver) - skrives til ledgeren i næste batch"""
+        self.ledger.record(prospect_supporter_id, prospect_supporter_navn, point_reward, "permanent",
+                           tildelt_af=tildelt_af)
+        self._notify_points(prospect_supporter_id, prospect_supporter_navn, point_reward)
+        return True
+
+    async def delete_member_job_by_id(self, job_id):
+        success, privat_kanal_id = await self.db.delete_member_job_by_id(job_id)
+        if success:
+            self._unindex(job_id)
+        return success, privat_kanal_id
+
+    async def reset_jobs_and_stats(self):
+        await self.ledger.flush()
+        await self.db.reset_jobs_and_stats()
+        self._jobs.clear()
+        self._by_number.clear()
+        self._by_status.clear()
+
+    # ---------- Permanente jobs (write-through) ----------
+
+    async def add_permanent_job(self, job_text):
+        if not await self.db.add_permanent_job(job_text):
+            return False
+        self._permanent.append(job_text)
+        return True
+
+    async def update_permanent_job(self, old_text, new_text):
+        if not await self.db.update_permanent_job(old_text, new_text):
+            return False
+        self._permanent = [new_text if job == old_text else job for job in self._permanent]
+        return True
+
+    async def remove_permanent_job(self, job_text):
+        if not await self.db.remove_permanent_job(job_text):
+            return False
+        self._permanent = [job for job in self._permanent if job != job_text]
+        return True
@@ -0,0 +1,187 @@
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+
+
+class RankedBoard:
+    """Sorteret rangliste over (point, member) med binær søgning.
+
+    Nøglerne er (-point, member_id), så højeste point står først og lige
+    point har en stabil rækkefølge. Placering og opslag er O(log n).
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._points = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, member_id):
+        return member_id in self._points
+
+    def set(self, member_id, points):
+        """Indsæt eller flyt et member til den nye pointsum"""
+        self.remove(member_id)
+        self._points[member_id] = points
+        insort(self._keys, (-points, member_id))
+
+    def remove(self, member_id):
+        points = self._points.pop(member_id, None)
+        if points is None:
+            return
+        i = bisect_left(self._keys, (-points, member_id))
+        del self._keys[i]
+
+    def rank(self, member_id):
+        """1-indekseret placering, eller None hvis member ikke er på listen"""
+        points = self._points.get(member_id)
+        if points is None:
+            return None
+        return bisect_left(self._keys, (-points, member_id)) + 1
+
+    def top(self, limit=None):
+        """[(member_id, point)] i rangorden"""
+        keys = self._keys if limit is None else self._keys[:limit]
+        return [(member_id, -negative_points) for negative_points, member_id in keys]
+
+
+class PointBuckets:
+    """Point per member per dag for de seneste dage.
+
+    En rullende rangliste summeres fra dagene i vinduet, så prisen afhænger
+    af vinduets længde og antallet af aktive members - ikke af historikken.
+    Dage ældre end keep_days smides væk når en ny dag begynder.
+    """
+
+    def __init__(self, keep_days=40):
+        self.keep_days = keep_days
+        self._days = {}  # date -> {member_id: point}
+
+    def load(self, rows):
+        """Indlæs [(dag 'YYYY-MM-DD', member_id, point)] fra point_buckets tabellen"""
+        self._days = {}
+        for dag, member_id, points in rows:
+            day = self._days.setdefault(date.fromisoformat(dag), {})
+            day[member_id] = day.get(member_id, 0) + points
+
+    def add(self, member_id, points, dag=None):
+        dag = dag or date.today()
+        if dag not in self._days:
+            self.prune(dag)
+        day = self._days.setdefault(dag, {})
+        day[member_id] = day.get(member_id, 0) + points
+
+    def prune(self, today=None):
+        oldest = (today or date.today()) - timedelta(days=self.keep_days)
+        for dag in [dag for dag in self._days if dag < oldest]:
+            del self._days[dag]
+
+    def totals(self, since):
+        """{member_id: point} summeret over alle dage fra og med since"""
+        totals = {}
+        for dag, day in self._days.items():
+            if dag < since:
+                continue
+            for member_id, points in day.items():
+                totals[member_id] = totals.get(member_id, 0) + points
+        return totals
+
+    def clear(self):
+        self._days.clear()
+
+
+def week_start(today=None):
+    """Mandag i indeværende uge"""
+    today = today or date.today()
+    return today - timedelta(days=today.weekday())
+
+
+def month_start(today=None):
+    return (today or date.today()).replace(day=1)
+
+
+# Rullende vinduer til ranglisterne: navn -> funktion der giver første dag i vinduet
+WINDOWS = {"uge": week_start, "måned": month_start}
+
+
+class Leaderboards:
+    """Ranglister per rolle (supporters, prospects) holdt i takt med rolle indekset.
+
+    Pointsummer for alle kendte members ligger i hukommelsen. Et member står
+    på en rangliste så længe det har rollen, så rangeringen kan læses direkte
+    uden en database forespørgsel, og en pointtildeling flytter kun ét member.
+    """
+
+    def __init__(self, role_index, boards):
+        self.role_index = role_index
+        self.boards = {name: RankedBoard() for name in boards}
+        self._role_ids = dict(boards)  # board navn -> rolle ID
+        self._totals = {}              # member_id -> point
+        self._names = {}               # member_id -> navn fra statistik tabellen
+        self.buckets = PointBuckets()
+        self.loaded = False
+
+    def load(self, rows):
+        """Indlæs [(member_id, navn, point)] fra statistik tabellen og byg ranglisterne"""
+        self._totals = {member_id: points for member_id, _, points in rows}
+        self._names = {member_id: navn for member_id, navn, _ in rows}
+        self.rebuild()
+        self.loaded = True
+
+    def load_buckets(self, rows):
+        """Indlæs daglige point buckets til de rullende ranglister"""
+        self.buckets.load(rows)
+
+    def rebuild(self):
+        """Byg ranglisterne forfra ud fra rolle indekset"""
+        for name, board in self.boards.items():
+            self.boards[name] = board = RankedBoard()
+            for member_id in self.role_index.members(self._role_ids[name]):
+                board.set(member_id, self._totals.get(member_id, 0))
+
+    def sync_member(self, member_id):
+        """Opdater et members placering på ranglisterne efter en rolle ændring"""
+        for name, board in self.boards.items():
+            if self.role_index.has_role(member_id, self._role_ids[name]):
+                if member_id not in board:
+                    board.set(member_id, self._totals.get(member_id, 0))
+            else:
+                board.remove(member_id)
+
+    def award(self, member_id, navn, points):
+        """Læg point til et member og flyt det på de ranglister det står på"""
+        total = self._totals.get(member_id, 0) + points
+        self._totals[member_id] = total
+        if navn:
+            self._names[member_id] = navn
+        self.buckets.add(member_id, points)
+        for board in self.boards.values():
+            if member_id in board:
+                board.set(member_id, total)
+
+    def clear(self):
+        """Nulstil alle point (bruges når systemet nulstilles)"""
+        self._totals.clear()
+        self._names.clear()
+        self.buckets.clear()
+        self.rebuild()
+
+    def rows(self, name, limit=None):
+        """[(member_id, navn, point)] for en rangliste - samme form som den gamle SQL forespørgsel"""
+        return [(member_id, self.role_index.name(member_id, self._names.get(member_id, "Ukendt")), points)
+                for member_id, points in self.boards[name].top(limit)]
+
+    def window_rows(self, name, window, limit=None):
+        """[(member_id, navn, point)] for en rangliste inden for et rullende vindue ("uge" eller "måned").
+        Kun members med point i vinduet tages med."""
+        totals = self.buckets.totals(WINDOWS[window]())
+        board = self.boards[name]
+        ranked = sorted((-points, member_id) for member_id, points in totals.items()
+                        if points and member_id in board)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(member_id, self.role_index.name(member_id, self._names.get(member_id, "Ukendt")), -negative_points)
+                for negative_points, member_id in ranked]
+
+    def rank(self, name, member_id):
+        return self.boards[name].rank(member_id)
@@ -0,0 +1,59 @@
+import asyncio
+
+
+class MemberEventQueue:
+    """Begrænset kø for member events der anvendes i batches.
+
+    Events lægges i køen uden at vente. Workeren samler alt der ankommer
+    inden for batch vinduet, kollapser flere ændringer for samme member til
+    den seneste tilstand og kalder apply_batch én gang per batch. Hvis køen
+    løber fuld droppes eventet, og næste batch beder om en fuld resync.
+    """
+
+    def __init__(self, apply_batch, maxsize=500, batch_window=2.0):
+        self.apply_batch = apply_batch
+        self.batch_window = batch_window
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._worker = None
+        self._resync_needed = False
+        self.stats = {"received": 0, "filtered": 0, "dropped": 0, "coalesced": 0, "applied": 0, "batches": 0}
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def filtered(self):
+        """Tæl et event der blev sorteret fra som irrelevant"""
+        self.stats["filtered"] += 1
+
+    def put(self, member_id, role_ids, display_name=None):
+        """Læg en members nye rolle tilstand i køen (role_ids=() betyder forladt)"""
+        self.stats["received"] += 1
+        try:
+            self._queue.put_nowait((member_id, frozenset(role_ids), display_name))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            self._resync_needed = True
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            await asyncio.sleep(self.batch_window)
+
+            # Kollaps alle events i batchen til seneste tilstand per member
+            batch = {first[0]: first[1:]}
+            events = 1
+            while not self._queue.empty():
+                member_id, role_ids, display_name = self._queue.get_nowait()
+                batch[member_id] = (role_ids, display_name)
+                events += 1
+
+            self.stats["coalesced"] += events - len(batch)
+            self.stats["applied"] += len(batch)
+            self.stats["batches"] += 1
+            resync, self._resync_needed = self._resync_needed, False
+
+            try:
+                await self.apply_batch(batch, resync)
+            except Exception as e:
+                print(f"❌ Fejl ved behandling af member events: {e}")
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+import discord
+
+
+class MemberResolver:
+    """Slår members/brugere op billigst muligt: guild cache, så LRU cache med TTL, så API.
+
+    Samtidige API opslag for samme ID deles, så en bølge af klik kun giver
+    ét fetch_user kald. Brugere der ikke findes caches også (som None), så
+    slettede konti ikke slås op igen og igen inden for TTL.
+    """
+
+    def __init__(self, bot, maxsize=512, ttl=600):
+        self.bot = bot
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._cache = OrderedDict()  # user_id -> (udløber, user eller None)
+        self._inflight = {}          # user_id -> task
+        self.stats = {"guild_hits": 0, "lru_hits": 0, "api_calls": 0, "deduped": 0, "not_found": 0}
+
+    async def resolve(self, user_id, guild=None):
+        """Member fra guild cachen hvis muligt, ellers en User - None hvis brugeren ikke findes"""
+        if guild is not None:
+            member = guild.get_member(user_id)
+            if member is not None:
+                self.stats["guild_hits"] += 1
+                return member
+
+        entry = self._cache.get(user_id)
+        if entry is not None:
+            expires, user = entry
+            if expires > time.monotonic():
+                self._cache.move_to_end(user_id)
+                self.stats["lru_hits"] += 1
+                return user
+            del self._cache[user_id]
+
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(user_id))
+            self._inflight[user_id] = task
+        else:
+            self.stats["deduped"] += 1
+        return await asyncio.shield(task)
+
+    async def display_name(self, user_id, guild=None, default="Ukendt"):
+        user = await self.resolve(user_id, guild)
+        return user.display_name if user is not None else default
+
+    async def _fetch(self, user_id):
+        self.stats["api_calls"] += 1
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            self.stats["not_found"] += 1
+            user = None
+        finally:
+            self._inflight.pop(user_id, None)
+
+        self._cache[user_id] = (time.monotonic() + self.ttl, user)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return user
+
+    def format_stats(self):
+        return (f"Member opslag: {self.stats['guild_hits']} guild cache, {self.stats['lru_hits']} LRU, "
+                f"{self.stats['api_calls']} API ({self.stats['deduped']} delt, {self.stats['not_found']} ikke fundet)")
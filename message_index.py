@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+# Discord afviser bulk delete af beskeder ældre end 14 dage - lidt margin for ure der går forkert
+BULK_DELETE_MAX_ALDER = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_MAX_ANTAL = 100
+
+
+class MessageIndex:
+    """Persistent indeks over de beskeder botten har sendt, per kanal og formål.
+
+    Oprydning slår beskederne op i indekset i stedet for at scanne kanal
+    historikken, sletter op til 100 beskeder per bulk delete kald og falder
+    kun tilbage til enkelt sletninger for beskeder ældre end 14 dage.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def track(self, message, purpose=None):
+        await self.db.track_bot_messages([(message.id, message.channel.id)], purpose)
+
+    async def forget(self, message_ids):
+        await self.db.forget_tracked_messages(list(message_ids))
+
+    async def forget_channel(self, channel_id):
+        await self.db.forget_channel_messages(channel_id)
+
+    async def cleanup(self, kanal, purpose=None, keep=()):
+        """Slet alle registrerede bot beskeder i kanalen (evt. kun ét formål) undtagen keep"""
+        keep = set(keep)
+        message_ids = [i for i in await self.db.get_tracked_messages(kanal.id, purpose) if i not in keep]
+        return await self.delete(kanal, message_ids)
+
+    async def delete(self, kanal, message_ids):
+        """Slet beskederne med færrest mulige kald - returnerer (slettet, fejlet)"""
+        cutoff = datetime.now(timezone.utc) - BULK_DELETE_MAX_ALDER
+        recent = [i for i in message_ids if discord.utils.snowflake_time(i) > cutoff]
+        old = [i for i in message_ids if discord.utils.snowflake_time(i) <= cutoff]
+        gone = []
+        failed = 0
+
+        for start in range(0, len(recent), BULK_DELETE_MAX_ANTAL):
+            chunk = recent[start:start + BULK_DELETE_MAX_ANTAL]
+            try:
+                await kanal.delete_messages([discord.Object(id=i) for i in chunk])
+                gone.extend(chunk)
+            except discord.NotFound:
+                # Mindst én besked var allerede væk - slet resten enkeltvis
+                old.extend(chunk)
+            except discord.HTTPException as e:
+                failed += len(chunk)
+                print(f"⚠️ Bulk sletning af {len(chunk)} beskeder i {kanal.name} fejlede: {e}")
+
+        for message_id in old:
+            try:
+                await kanal.get_partial_message(message_id).delete()
+                gone.append(message_id)
+            except discord.NotFound:
+                gone.append(message_id)
+            except discord.HTTPException as e:
+                failed += 1
+                print(f"⚠️ Kunne ikke slette besked {message_id} i {kanal.name}: {e}")
+
+        # Fejlede sletninger bliver i indekset, så næste oprydning prøver igen
+        if gone:
+            await self.forget(gone)
+        return len(gone), failed
@@ -0,0 +1,306 @@
+import re
+
+SCHEMA_VERSION_TABLE = '''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        beskrivelse TEXT NOT NULL,
+        applied_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _baseline(cursor):
+    """Tabellerne som de så ud før migrationerne blev versionerede (idempotent på eksisterende databaser)"""
+    # Create tables
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS permanent_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_text TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS member_jobs (
+            id TEXT PRIMARY KEY,
+            titel TEXT NOT NULL,
+            beskrivelse TEXT NOT NULL,
+            belonning TEXT,
+            point_reward INTEGER DEFAULT 0,
+            oprettet_af INTEGER NOT NULL,
+            oprettet_navn TEXT NOT NULL,
+            status TEXT DEFAULT 'ledig',
+            prospect_supporter_id INTEGER,
+            prospect_supporter_navn TEXT,
+            privat_kanal_id INTEGER,
+            oprettet_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            taget_tid TIMESTAMP,
+            job_number INTEGER
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS completed_jobs (
+            id TEXT PRIMARY KEY,
+            titel TEXT NOT NULL,
+            beskrivelse TEXT NOT NULL,
+            belonning TEXT,
+            point_reward INTEGER DEFAULT 0,
+            oprettet_af INTEGER NOT NULL,
+            oprettet_navn TEXT NOT NULL,
+            prospect_supporter_id INTEGER NOT NULL,
+            prospect_supporter_navn TEXT NOT NULL,
+            completed_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            job_number INTEGER
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS prospect_supporter_stats (
+            prospect_supporter_id INTEGER PRIMARY KEY,
+            prospect_supporter_navn TEXT NOT NULL,
+            total_points INTEGER DEFAULT 0,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Migration: Omdøb gamle prospect_supporter_stats hvis den eksisterer
+    cursor.execute('''
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='prospect_supporter_stats'
+    ''')
+    if cursor.fetchone():
+        # Check om total_points kolonne eksisterer
+        cursor.execute('PRAGMA table_info(prospect_supporter_stats)')
+        columns = [col[1] for col in cursor.fetchall()]
+        if 'total_points' not in columns:
+            try:
+                cursor.execute('ALTER TABLE prospect_supporter_stats RENAME TO prospect_supporter_stats_old')
+                cursor.execute('ALTER TABLE prospect_supporter_stats RENAME TO prospect_supporter_stats_backup')
+            except:
+                pass
+
+    # Migration: Kontrol panel besked ID gemmes ved siden af privat_kanal_id
+    cursor.execute('PRAGMA table_info(member_jobs)')
+    if 'kontrol_panel_id' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE member_jobs ADD COLUMN kontrol_panel_id INTEGER')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    ''')
+
+    # Indeks over alle beskeder botten har sendt, så oprydning ikke kræver history scans
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bot_messages (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER NOT NULL,
+            purpose TEXT NOT NULL DEFAULT 'ukendt',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bot_messages_channel ON bot_messages (channel_id, purpose)')
+
+    # Åbne permanente opgave sessioner - bruges til at fordele admins efter belastning
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS permanent_sessions (
+            channel_id INTEGER PRIMARY KEY,
+            admin_id INTEGER NOT NULL,
+            prospect_supporter_id INTEGER NOT NULL,
+            job_number INTEGER,
+            oprettet_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _hot_query_indexes(cursor):
+    """Indekser til de forespørgsler botten kører ofte, inkl. et UNIQUE job nummer"""
+    # Ældre databaser kan have dubletter af job nummer - giv dem nye numre fra tælleren først
+    cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('job_counter', '1')")
+    job_counter = int(cursor.execute("SELECT value FROM settings WHERE key = 'job_counter'").fetchone()[0])
+    max_number = cursor.execute("SELECT COALESCE(MAX(job_number), 0) FROM member_jobs").fetchone()[0]
+    job_counter = max(job_counter, max_number + 1)
+
+    duplicates = cursor.execute('''
+        SELECT rowid FROM member_jobs AS m
+        WHERE job_number IS NOT NULL
+          AND rowid > (SELECT MIN(rowid) FROM member_jobs WHERE job_number = m.job_number)
+    ''').fetchall()
+    for (rowid,) in duplicates:
+        cursor.execute("UPDATE member_jobs SET job_number = ? WHERE rowid = ?", (job_counter, rowid))
+        job_counter += 1
+    cursor.execute("UPDATE settings SET value = ? WHERE key = 'job_counter'", (str(job_counter),))
+
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_member_jobs_job_number ON member_jobs (job_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_member_jobs_status ON member_jobs (status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_member_jobs_privat_kanal ON member_jobs (privat_kanal_id)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_completed_jobs_prospect_supporter
+        ON completed_jobs (prospect_supporter_id, completed_tid)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_completed_jobs_completed_tid ON completed_jobs (completed_tid)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_prospect_supporter_stats_points
+        ON prospect_supporter_stats (total_points)
+    ''')
+
+
+def _point_ledger(cursor):
+    """Append-only point ledger - eksisterende summer bliver til en start saldo per member"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS point_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            prospect_supporter_id INTEGER NOT NULL,
+            prospect_supporter_navn TEXT,
+            points INTEGER NOT NULL,
+            kilde TEXT NOT NULL,
+            job_id TEXT,
+            tildelt_af INTEGER,
+            oprettet_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_point_events_prospect_supporter
+        ON point_events (prospect_supporter_id, oprettet_tid)
+    ''')
+    cursor.execute('''
+        INSERT INTO point_events (prospect_supporter_id, prospect_supporter_navn, points, kilde)
+        SELECT prospect_supporter_id, prospect_supporter_navn, total_points, 'start_saldo'
+        FROM prospect_supporter_stats
+        WHERE total_points != 0
+    ''')
+
+    # Start saldoen er allerede med i snapshot tabellen
+    last_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM point_events").fetchone()[0]
+    cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('point_events_compacted_id', ?)",
+                   (str(last_id),))
+
+
+def _point_buckets(cursor):
+    """Point per member per dag, så rullende ranglister (uge/måned) ikke skal scanne historikken"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS point_buckets (
+            dag TEXT NOT NULL,
+            prospect_supporter_id INTEGER NOT NULL,
+            points INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dag, prospect_supporter_id)
+        ) WITHOUT ROWID
+    ''')
+
+    # Udfyld fra historikken - start saldoer har ingen dato og tælles ikke med
+    cursor.execute('''
+        INSERT INTO point_buckets (dag, prospect_supporter_id, points)
+        SELECT dag, prospect_supporter_id, SUM(points) FROM (
+            SELECT date(oprettet_tid, 'localtime') AS dag, prospect_supporter_id, points
+            FROM point_events WHERE kilde != 'start_saldo'
+            UNION ALL
+            SELECT date(completed_tid, 'localtime'), prospect_supporter_id, point_reward
+            FROM completed_jobs
+            WHERE point_reward != 0
+              AND id NOT IN (SELECT job_id FROM point_events WHERE job_id IS NOT NULL)
+        )
+        WHERE dag IS NOT NULL
+        GROUP BY dag, prospect_supporter_id
+    ''')
+
+
+# (version, beskrivelse, funktion) - tilføj kun nye versioner i bunden, ændr aldrig gamle
+MIGRATIONS = [
+    (1, "Basis tabeller", _baseline),
+    (2, "Indekser til hot queries", _hot_query_indexes),
+    (3, "Append-only point ledger", _point_ledger),
+    (4, "Daglige point buckets", _point_buckets),
+]
+
+
+def current_version(conn):
+    conn.execute(SCHEMA_VERSION_TABLE)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Kør alle manglende migrationer, hver i sin egen transaktion - returnerer de anvendte versioner"""
+    version = current_version(conn)
+    conn.commit()
+    applied = []
+    for migration_version, beskrivelse, migration in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        conn.execute("BEGIN")
+        try:
+            migration(conn.cursor())
+            conn.execute("INSERT INTO schema_version (version, beskrivelse) VALUES (?, ?)",
+                         (migration_version, beskrivelse))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration_version)
+    return applied
+
+
+# Forespørgsler der køres ofte og aldrig må scanne en hel tabel (parametre er kun til planen)
+HOT_QUERIES = [
+    ("job efter nummer", "SELECT * FROM member_jobs WHERE job_number = ?", (1,)),
+    ("jobs efter status", "SELECT * FROM member_jobs WHERE status = ?", ("ledig",)),
+    ("aktive private kanaler",
+     "SELECT privat_kanal_id, id FROM member_jobs WHERE privat_kanal_id IS NOT NULL AND status = 'optaget'", ()),
+    ("job efter privat kanal", "SELECT * FROM member_jobs WHERE privat_kanal_id = ?", (1,)),
+    ("seneste færdige jobs",
+     "SELECT titel, prospect_supporter_navn, completed_tid, job_number FROM completed_jobs "
+     "ORDER BY completed_tid DESC LIMIT ?", (5,)),
+    ("seneste færdige jobs for members",
+     "SELECT titel, prospect_supporter_navn, completed_tid, job_number FROM completed_jobs "
+     "WHERE prospect_supporter_id IN (?, ?) ORDER BY completed_tid DESC LIMIT ?", (1, 2, 5)),
+    ("færdige jobs til arkivering",
+     "SELECT id FROM completed_jobs WHERE completed_tid < datetime('now', ?) ORDER BY completed_tid LIMIT ?",
+     ("-90 days", 500)),
+    ("leaderboard",
+     "SELECT prospect_supporter_id, prospect_supporter_navn, total_points FROM prospect_supporter_stats "
+     "ORDER BY total_points DESC", ()),
+    ("ikke komprimerede point events",
+     "SELECT prospect_supporter_id, SUM(points), MAX(id) FROM point_events NOT INDEXED WHERE id > ? "
+     "GROUP BY prospect_supporter_id", (0,)),
+    ("point buckets i vindue",
+     "SELECT dag, prospect_supporter_id, points FROM point_buckets WHERE dag >= ?", ("2024-01-01",)),
+    ("bot beskeder i kanal", "SELECT message_id FROM bot_messages WHERE channel_id = ? ORDER BY message_id", (1,)),
+]
+
+# Forespørgsler der bevidst læser hele tabellen - navn -> begrundelse
+FULL_SCAN_ALLOWED = {
+    "leaderboard": "alle pointsummer indlæses én gang ved opstart",
+}
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX (\w+))?$")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+class QueryPlanError(RuntimeError):
+    """En hot query scanner en hel tabel"""
+
+
+def full_table_scans(conn):
+    """Kør EXPLAIN QUERY PLAN på alle hot queries - returnerer [(navn, plan linje)] for fulde tabel scans.
+    En scan gennem et indeks tæller også, medmindre forespørgslen har LIMIT og dermed stopper tidligt."""
+    scans = []
+    for name, sql, params in HOT_QUERIES:
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall():
+            detail = row[-1]
+            match = _SCAN.match(detail)
+            if match is None:
+                continue
+            if match.group(2) and _LIMIT.search(sql):
+                continue
+            scans.append((name, detail))
+    return scans
+
+
+def check_query_plans(conn):
+    """Fejl højlydt hvis en hot query scanner en hel tabel"""
+    scans = full_table_scans(conn)
+    if scans:
+        raise QueryPlanError("; ".join(f"'{name}' scanner en hel tabel: {detail}" for name, detail in scans))
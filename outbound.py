@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict
+
+# Lavere tal kører først
+PRIORITET_INTERAKTION = 0  # Svar på interaktioner (3 sekunders deadline)
+PRIORITET_KANAL = 1        # Oprettelse af private kanaler o.l.
+PRIORITET_KOSMETISK = 2    # Board, stats og kontrol panel redigeringer
+
+# Returneres af submit når arbejdet blev droppet som forældet
+DROPPED = object()
+
+_current_route = contextvars.ContextVar("outbound_route", default=None)
+
+
+class _RateLimitLogHandler(logging.Handler):
+    """Fanger discord.py's rate limit logbeskeder og tilskriver dem den route der kører"""
+
+    def __init__(self, queue):
+        super().__init__(level=logging.WARNING)
+        self.queue = queue
+
+    def emit(self, record):
+        route = _current_route.get()
+        if route is None:
+            return
+        message = str(record.msg)
+        if "429" not in message and "rate limited" not in message:
+            return
+        stats = self.queue.stats[route]
+        stats["rate_limited"] += 1
+        retry_after = record.args[-1] if isinstance(record.args, tuple) and record.args else None
+        if isinstance(retry_after, (int, float)):
+            stats["rate_limit_wait"] += retry_after
+
+
+class OutboundQueue:
+    """Prioriteret kø mellem bottens logik og discord.py's HTTP kald.
+
+    Arbejde afleveres som en coroutine factory med en route og en prioritet.
+    Et antal workers tager altid det højest prioriterede arbejde først, og
+    nogle af dem er reserveret til interaktions svar, så hverken et stort
+    board rebuild eller en bølge af kanal oprettelser kan stå i vejen for et
+    svar der skal nå Discords 3 sekunders grænse. Kosmetisk arbejde
+    der er blevet forældet mens det ventede (stale() er sand) droppes.
+    """
+
+    def __init__(self, workers=4, reserved_workers=2):
+        self.workers = workers
+        self.reserved_workers = reserved_workers
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self._tasks = []
+        self.stats = defaultdict(lambda: {"calls": 0, "errors": 0, "dropped": 0, "rate_limited": 0,
+                                          "rate_limit_wait": 0.0, "queue_wait": 0.0})
+
+    def start(self):
+        """Start workers og koble rate limit metrikker på discord.py's HTTP logger"""
+        if self._tasks:
+            return
+        for i in range(self.workers):
+            reserved = i < self.reserved_workers
+            self._tasks.append(asyncio.create_task(self._run(reserved)))
+        logging.getLogger("discord.http").addHandler(_RateLimitLogHandler(self))
+
+    async def submit(self, route, factory, priority=PRIORITET_KOSMETISK, stale=None):
+        """Kø factory() og vent på resultatet - returnerer DROPPED hvis arbejdet blev droppet"""
+        future = asyncio.get_running_loop().create_future()
+        item = (priority, next(self._sequence), route, factory, stale, time.perf_counter(), future)
+        async with self._condition:
+            heapq.heappush(self._heap, item)
+            self._condition.notify_all()
+        return await future
+
+    def pending(self):
+        return len(self._heap)
+
+    async def _next(self, reserved):
+        async with self._condition:
+            while True:
+                if self._heap and (not reserved or self._heap[0][0] == PRIORITET_INTERAKTION):
+                    return heapq.heappop(self._heap)
+                await self._condition.wait()
+
+    async def _run(self, reserved):
+        while True:
+            priority, _, route, factory, stale, queued_at, future = await self._next(reserved)
+            stats = self.stats[route]
+            stats["queue_wait"] += time.perf_counter() - queued_at
+
+            if future.cancelled():
+                continue
+            if stale is not None and stale():
+                stats["dropped"] += 1
+                future.set_result(DROPPED)
+                continue
+
+            token = _current_route.set(route)
+            try:
+                result = await factory()
+                stats["calls"] += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                stats["errors"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                _current_route.reset(token)
+
+    def format_stats(self):
+        """Én linje per route med kald, fejl, droppede, 429'ere og ventetid"""
+        lines = []
+        for route, stats in sorted(self.stats.items()):
+            lines.append(f"{route}: {stats['calls']} kald, {stats['errors']} fejl, {stats['dropped']} droppet, "
+                         f"{stats['rate_limited']}x 429 ({stats['rate_limit_wait']:.1f}s), "
+                         f"kø ventetid {stats['queue_wait']:.1f}s")
+        return lines
@@ -0,0 +1,79 @@
+import asyncio
+
+
+class PointLedger:
+    """Batch skriver til den append-only point ledger plus en baggrunds compactor.
+
+    Pointtildelinger lægges i en buffer og skrives som én executemany inden
+    for batch vinduet (eller med det samme når bufferen er fuld). Compactoren
+    folder med jævne mellemrum nye events ind i prospect_supporter_stats, så
+    summerne kan læses direkte og ledgeren altid kan genafspilles.
+    """
+
+    def __init__(self, db, batch_window=1.0, max_batch=100, compact_interval=300):
+        self.db = db
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.compact_interval = compact_interval
+        self._pending = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+        self._compactor = None
+        self.stats = {"recorded": 0, "written": 0, "batches": 0, "compacted": 0, "compactions": 0}
+
+    def start(self):
+        if self._compactor is None or self._compactor.done():
+            self._compactor = asyncio.create_task(self._compact_loop())
+
+    def record(self, member_id, navn, points, kilde, job_id=None, tildelt_af=None):
+        """Læg et point event i bufferen - skrives i næste batch"""
+        self._pending.append((member_id, navn, points, kilde, job_id, tildelt_af))
+        self.stats["recorded"] += 1
+        if self._flush_task is None or self._flush_task.done():
+            delay = 0 if len(self._pending) >= self.max_batch else self.batch_window
+            self._flush_task = asyncio.create_task(self._delayed_flush(delay))
+
+    async def _delayed_flush(self, delay):
+        await asyncio.sleep(delay)
+        # Denne task er færdig med at vente - ryd den så en fejlet skrivning kan planlægge et nyt forsøg
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        """Skriv alle ventende events nu"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            if await self.db.append_point_events(batch):
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+                return
+            # Behold eventsene og prøv igen lidt senere
+            self._pending[:0] = batch
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush(self.batch_window * 5))
+
+    async def compact(self):
+        """Skriv bufferen og fold alle nye events ind i snapshot tabellen"""
+        await self.flush()
+        events, members = await self.db.compact_point_events()
+        if events:
+            self.stats["compacted"] += events
+            self.stats["compactions"] += 1
+        return events, members
+
+    async def _compact_loop(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                events, members = await self.compact()
+                if events:
+                    print(f"🧮 Point ledger: {events} events foldet ind for {members} members")
+            except Exception as e:
+                print(f"Fejl i point compactor: {e}")
+
+    def format_stats(self):
+        return (f"Point ledger: {self.stats['written']}/{self.stats['recorded']} events skrevet i "
+                f"{self.stats['batches']} batches, {self.stats['compacted']} komprimeret, "
+                f"{len(self._pending)} venter")
@@ -3,12 +3,29 @@ from dotenv import load_dotenv
 import discord
 from discord.ext import commands, tasks
 from discord.ui import Button, View, Modal, TextInput, Select
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 import asyncio
-import sqlite3
+import hashlib
+import signal
+import time
 from pathlib import Path
 
+from database import Database
+from job_store import JobStore
+from board_renderer import BoardRenderer
+from refresh import RefreshScheduler
+from role_index import RoleIndex
+from member_events import MemberEventQueue
+from message_index import MessageIndex
+from channel_pool import ChannelPool
+from member_resolver import MemberResolver
+from admin_roster import AdminRoster
+from leaderboard import Leaderboards
+from points_ledger import PointLedger
+from job_archive import JobArchive, job_key
+from outbound import OutboundQueue, DROPPED, PRIORITET_INTERAKTION, PRIORITET_KANAL, PRIORITET_KOSMETISK
+
 # Miljøvariabler og token
 load_dotenv()  # Load from .env file if exists
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -55,566 +72,451 @@ PRIVAT_KATEGORI_ID = 1439340235820499036
 DATA_DIR = Path("/data") if Path("/data").exists() else Path(".")
 DB_PATH = DATA_DIR / "prospect_supporter_bot.db"
 
-# Default permanent jobs
-DEFAULT_PERMANENT_JOBS = [
+# Færdige jobs ældre end dette flyttes til komprimerede arkiv segmenter
+ARKIV_DIR = DATA_DIR / "arkiv"
+ARKIV_EFTER_DAGE = 90
 
-]
+# Ændringer inden for dette vindue samles i én render af samme kanal
+REFRESH_DEBOUNCE_SEKUNDER = 1.5
 
-def init_database():
-    """Initialize SQLite database"""
-    try:
-        # Ensure data directory exists
-        DATA_DIR.mkdir(exist_ok=True)
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS permanent_jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_text TEXT UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS member_jobs (
-                id TEXT PRIMARY KEY,
-                titel TEXT NOT NULL,
-                beskrivelse TEXT NOT NULL,
-                belonning TEXT,
-                point_reward INTEGER DEFAULT 0,
-                oprettet_af INTEGER NOT NULL,
-                oprettet_navn TEXT NOT NULL,
-                status TEXT DEFAULT 'ledig',
-                prospect_supporter_id INTEGER,
-                prospect_supporter_navn TEXT,
-                privat_kanal_id INTEGER,
-                oprettet_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                taget_tid TIMESTAMP,
-                job_number INTEGER
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS completed_jobs (
-                id TEXT PRIMARY KEY,
-                titel TEXT NOT NULL,
-                beskrivelse TEXT NOT NULL,
-                belonning TEXT,
-                point_reward INTEGER DEFAULT 0,
-                oprettet_af INTEGER NOT NULL,
-                oprettet_navn TEXT NOT NULL,
-                prospect_supporter_id INTEGER NOT NULL,
-                prospect_supporter_navn TEXT NOT NULL,
-                completed_tid TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                job_number INTEGER
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS prospect_supporter_stats (
-                prospect_supporter_id INTEGER PRIMARY KEY,
-                prospect_supporter_navn TEXT NOT NULL,
-                total_points INTEGER DEFAULT 0,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Migration: Omdøb gamle prospect_supporter_stats hvis den eksisterer
-        cursor.execute('''
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='prospect_supporter_stats'
-        ''')
-        if cursor.fetchone():
-            # Check om total_points kolonne eksisterer
-            cursor.execute('PRAGMA table_info(prospect_supporter_stats)')
-            columns = [col[1] for col in cursor.fetchall()]
-            if 'total_points' not in columns:
-                try:
-                    cursor.execute('ALTER TABLE prospect_supporter_stats RENAME TO prospect_supporter_stats_old')
-                    cursor.execute('ALTER TABLE prospect_supporter_stats RENAME TO prospect_supporter_stats_backup')
-                except:
-                    pass
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            )
-        ''')
-        
-        # Disabled: Markbetalinger
-        # cursor.execute('''
-        #     CREATE TABLE IF NOT EXISTS markbetalinger (
-        #         id INTEGER PRIMARY KEY AUTOINCREMENT,
-        #         navn TEXT NOT NULL,
-        #         telefon TEXT NOT NULL,
-        #         tidsperiode TEXT NOT NULL,
-        #         betalingsdato TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        #         udlobsdato TIMESTAMP,
-        #         oprettet_af INTEGER NOT NULL,
-        #         oprettet_navn TEXT NOT NULL
-        #     )
-        # ''')
-        
-        # Insert default permanent jobs if none exist
-        cursor.execute("SELECT COUNT(*) FROM permanent_jobs")
-        if cursor.fetchone()[0] == 0:
-            for job in DEFAULT_PERMANENT_JOBS:
-                cursor.execute("INSERT OR IGNORE INTO permanent_jobs (job_text) VALUES (?)", (job,))
-        
-        # Initialize job counter if not exists
-        cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('job_counter', '1')")
-        
-        conn.commit()
-        conn.close()
-        print("✅ Database initialized successfully")
-        
-    except Exception as e:
-        print(f"❌ Fejl ved database initialisering: {e}")
+# Member events samles i batches af dette vindue, og køen er begrænset
+MEMBER_EVENT_BATCH_SEKUNDER = 2.0
+MEMBER_EVENT_KOE_STOERRELSE = 500
 
-def get_permanent_jobs():
-    """Get all permanent jobs from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT job_text FROM permanent_jobs ORDER BY id")
-        jobs = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return jobs
-    except Exception as e:
-        print(f"Fejl ved hentning af permanente jobs: {e}")
-        return DEFAULT_PERMANENT_JOBS
+# Maks antal private kanaler der opdateres samtidig
+PRIVAT_KANAL_OPDATERING_SAMTIDIGE = 3
+KONTROL_PANEL_VERSION = "2"  # Bumpes når kontrol panelernes knap format ændres
 
-def add_permanent_job(job_text):
-    """Add permanent job to database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO permanent_jobs (job_text) VALUES (?)", (job_text,))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        return False  # Job already exists
-    except Exception as e:
-        print(f"Fejl ved tilføjelse af permanent job: {e}")
-        return False
+# Maks antal faste kanaler der sættes op samtidig ved opstart (deler Discords globale rate limit)
+KANAL_SETUP_SAMTIDIGE = 2
 
-def update_permanent_job(old_text, new_text):
-    """Update permanent job in database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE permanent_jobs SET job_text = ? WHERE job_text = ?", (new_text, old_text))
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
-    except Exception as e:
-        print(f"Fejl ved opdatering af permanent job: {e}")
-        return False
+# Job boardet er altid det samme antal beskeder - flere jobs bladres igennem per bruger
+# (højst 20 knapper per side, så bladreknapperne altid har den nederste række)
+BOARD_MEDLEM_JOBS_PER_SIDE = 8
+BOARD_PERMANENTE_PER_SIDE = 10
 
-def remove_permanent_job(job_text):
-    """Remove permanent job from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM permanent_jobs WHERE job_text = ?", (job_text,))
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
-    except Exception as e:
-        print(f"Fejl ved fjernelse af permanent job: {e}")
-        return False
-
-def get_member_jobs():
-    """Get all member jobs from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, titel, beskrivelse, belonning, point_reward, oprettet_af, oprettet_navn, 
-                   status, prospect_supporter_id, prospect_supporter_navn, privat_kanal_id, oprettet_tid, 
-                   taget_tid, job_number
-            FROM member_jobs 
-            ORDER BY job_number
-        """)
-        jobs = []
-        for row in cursor.fetchall():
-            job = {
-                "id": row[0], "titel": row[1], "beskrivelse": row[2], "belonning": row[3],
-                "point_reward": row[4] if len(row) > 4 else 0, "oprettet_af": row[5], "oprettet_navn": row[6], 
-                "status": row[7], "prospect_supporter_id": row[8], "prospect_supporter_navn": row[9], 
-                "privat_kanal_id": row[10], "oprettet_tid": row[11], "taget_tid": row[12], 
-                "job_number": row[13]
-            }
-            jobs.append(job)
-        conn.close()
-        return jobs
-    except Exception as e:
-        print(f"Fejl ved hentning af medlem jobs: {e}")
-        return []
-
-def add_member_job(job_data):
-    """Add member job to database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get next job number
-        cursor.execute("SELECT value FROM settings WHERE key = 'job_counter'")
-        job_counter = int(cursor.fetchone()[0])
-        
-        cursor.execute("""
-            INSERT INTO member_jobs 
-            (id, titel, beskrivelse, belonning, point_reward, oprettet_af, oprettet_navn, job_number)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            job_data["id"], job_data["titel"], job_data["beskrivelse"],
-            job_data["belonning"], job_data.get("point_reward", 0), 
-            job_data["oprettet_af"], job_data["oprettet_navn"],
-            job_counter
-        ))
-        
-        # Update job counter
-        cursor.execute("UPDATE settings SET value = ? WHERE key = 'job_counter'", (str(job_counter + 1),))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Fejl ved tilføjelse af medlem job: {e}")
-        return False
-
-def update_member_job_status(job_id, status, prospect_supporter_id=None, prospect_supporter_navn=None):
-    """Update member job status in database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        if prospect_supporter_id and prospect_supporter_navn:
-            cursor.execute("""
-                UPDATE member_jobs 
-                SET status = ?, prospect_supporter_id = ?, prospect_supporter_navn = ?, taget_tid = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (status, prospect_supporter_id, prospect_supporter_navn, job_id))
-        else:
-            cursor.execute("UPDATE member_jobs SET status = ? WHERE id = ?", (status, job_id))
-        
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
-    except Exception as e:
-        print(f"Fejl ved opdatering af job status: {e}")
-        return False
+# Varm pulje af skjulte private kanaler - skrumper mod minimum når den ikke bruges
+PRIVAT_KANAL_POOL_STOERRELSE = 2
+PRIVAT_KANAL_POOL_MINIMUM = 0
+PRIVAT_KANAL_POOL_TOMGANG_MINUTTER = 30
 
-def update_private_channel_id(job_id, channel_id):
-    """Update private channel ID for a job"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE member_jobs SET privat_kanal_id = ? WHERE id = ?", (channel_id, job_id))
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
-    except Exception as e:
-        print(f"Fejl ved opdatering af kanal ID: {e}")
-        return False
+# Hvor ofte point ledgeren foldes ind i stats tabellen
+POINT_KOMPRIMERING_MINUTTER = 5
 
-def get_all_active_private_channels():
-    """Get all active private channel IDs from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT privat_kanal_id, id FROM member_jobs WHERE privat_kanal_id IS NOT NULL AND status = 'optaget'")
-        channels = cursor.fetchall()
-        conn.close()
-        return channels
-    except Exception as e:
-        print(f"Fejl ved hentning af private kanaler: {e}")
-        return []
+# LRU cache til brugere der ikke er i guild cachen
+MEMBER_CACHE_STOERRELSE = 512
+MEMBER_CACHE_TTL_SEKUNDER = 600
 
-def complete_member_job(job_id):
-    """Complete a member job and update stats (bruges til legacy/fallback)"""
-    return complete_member_job_with_points(job_id, 0)
+# Workers i den udgående kø - de reserverede tager kun interaktions svar
+OUTBOUND_WORKERS = 4
+OUTBOUND_RESERVEREDE_WORKERS = 2
 
-def complete_member_job_with_points(job_id, point_reward):
-    """Complete a member job and update stats with specified point reward"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get job data
-        cursor.execute("SELECT * FROM member_jobs WHERE id = ?", (job_id,))
-        job_row = cursor.fetchone()
-        if not job_row:
-            conn.close()
-            return False
-        
-        # Move to completed_jobs
-        cursor.execute("""
-            INSERT INTO completed_jobs 
-            (id, titel, beskrivelse, belonning, point_reward, oprettet_af, oprettet_navn, 
-             prospect_supporter_id, prospect_supporter_navn, job_number)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (job_row[0], job_row[1], job_row[2], job_row[3], point_reward, job_row[5], 
-              job_row[6], job_row[8], job_row[9], job_row[13]))
-        
-        # Update prospect_supporter stats with points
-        cursor.execute("""
-            INSERT OR REPLACE INTO prospect_supporter_stats (prospect_supporter_id, prospect_supporter_navn, total_points)
-            VALUES (?, ?, COALESCE((SELECT total_points FROM prospect_supporter_stats WHERE prospect_supporter_id = ?), 0) + ?)
-        """, (job_row[8], job_row[9], job_row[8], point_reward))
-        
-        # Remove from member_jobs
-        cursor.execute("DELETE FROM member_jobs WHERE id = ?", (job_id,))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Fejl ved færdiggørelse af job: {e}")
-        return False
+# Default permanent jobs
+DEFAULT_PERMANENT_JOBS = [
 
-def get_member_job_by_id(job_id):
-    """Get specific member job by ID"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, titel, beskrivelse, belonning, oprettet_af, oprettet_navn, 
-                   status, prospect_supporter_id, prospect_supporter_navn, privat_kanal_id, oprettet_tid, 
-                   taget_tid, job_number
-            FROM member_jobs WHERE id = ?
-        """, (job_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return {
-                "id": row[0], "titel": row[1], "beskrivelse": row[2], "belonning": row[3],
-                "oprettet_af": row[4], "oprettet_navn": row[5], "status": row[6],
-                "prospect_supporter_id": row[7], "prospect_supporter_navn": row[8], "privat_kanal_id": row[9],
-                "oprettet_tid": row[10], "taget_tid": row[11], "job_number": row[12]
-            }
-        return None
-    except Exception as e:
-        print(f"Fejl ved hentning af job: {e}")
-        return None
+]
 
-def get_member_job_by_number(job_number):
-    """Get specific member job by job number"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, titel, beskrivelse, belonning, oprettet_af, oprettet_navn, 
-                   status, prospect_supporter_id, prospect_supporter_navn, privat_kanal_id, oprettet_tid, 
-                   taget_tid, job_number
-            FROM member_jobs WHERE job_number = ?
-        """, (job_number,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return {
-                "id": row[0], "titel": row[1], "beskrivelse": row[2], "belonning": row[3],
-                "oprettet_af": row[4], "oprettet_navn": row[5], "status": row[6],
-                "prospect_supporter_id": row[7], "prospect_supporter_navn": row[8], "privat_kanal_id": row[9],
-                "oprettet_tid": row[10], "taget_tid": row[11], "job_number": row[12]
-            }
-        return None
-    except Exception as e:
-        print(f"Fejl ved hentning af job: {e}")
-        return None
+db = Database(DB_PATH, DEFAULT_PERMANENT_JOBS)
+point_ledger = PointLedger(db, compact_interval=POINT_KOMPRIMERING_MINUTTER * 60)
+job_store = JobStore(db, point_ledger)
+job_archive = JobArchive(db, ARKIV_DIR, max_age_days=ARKIV_EFTER_DAGE)
+board_renderer = BoardRenderer(db, "board_messages")
+stats_renderer = BoardRenderer(db, "stats_messages")
+oprettelse_renderer = BoardRenderer(db, "oprettelse_messages")
+admin_panel_renderer = BoardRenderer(db, "admin_panel_messages")
+message_index = MessageIndex(db)
+startup_timings = []  # (fase, sekunder) for seneste opstart
+bootstrap_lock = asyncio.Lock()
+kanal_setup_budget = asyncio.Semaphore(KANAL_SETUP_SAMTIDIGE)
+channel_pool = ChannelPool(
+    bot,
+    PRIVAT_KATEGORI_ID,
+    size=PRIVAT_KANAL_POOL_STOERRELSE,
+    min_size=PRIVAT_KANAL_POOL_MINIMUM,
+    idle_timeout=PRIVAT_KANAL_POOL_TOMGANG_MINUTTER * 60
+)
+admin_roster = AdminRoster()
+member_resolver = MemberResolver(bot, maxsize=MEMBER_CACHE_STOERRELSE, ttl=MEMBER_CACHE_TTL_SEKUNDER)
+baggrunds_opgaver = set()  # Referencer til fire-and-forget tasks så de ikke bliver garbage collected
+outbound = OutboundQueue(workers=OUTBOUND_WORKERS, reserved_workers=OUTBOUND_RESERVEREDE_WORKERS)
+bootstrapped = False  # Sættes efter første on_ready - senere on_ready er reconnects
+refresh_scheduler = RefreshScheduler(debounce=REFRESH_DEBOUNCE_SEKUNDER)
+privat_kanal_semaphore = asyncio.Semaphore(PRIVAT_KANAL_OPDATERING_SAMTIDIGE)
+role_index = RoleIndex([SUPPORTER_ROLLE_ID, PROSPECT_ROLLE_ID, *ADMIN_ROLLE_IDS])
+leaderboards = Leaderboards(role_index, {"supporter": SUPPORTER_ROLLE_ID, "prospect": PROSPECT_ROLLE_ID})
+member_event_queue = MemberEventQueue(
+    lambda batch, resync: apply_member_event_batch(batch, resync),
+    maxsize=MEMBER_EVENT_KOE_STOERRELSE,
+    batch_window=MEMBER_EVENT_BATCH_SEKUNDER
+)
 
-def delete_member_job_by_id(job_id):
-    """Delete a member job by ID and close its private channel if exists"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get job info before deleting
-        cursor.execute("SELECT privat_kanal_id FROM member_jobs WHERE id = ?", (job_id,))
-        row = cursor.fetchone()
-        privat_kanal_id = row[0] if row else None
-        
-        # Delete the job
-        cursor.execute("DELETE FROM member_jobs WHERE id = ?", (job_id,))
-        
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        
-        return success, privat_kanal_id
-    except Exception as e:
-        print(f"Fejl ved sletning af job: {e}")
-        return False, None
 
 # Disabled: Markbetalinger
 # def get_markbetalinger():
-    """Get all markbetalinger from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, navn, telefon, tidsperiode, betalingsdato, udlobsdato, 
-                   oprettet_af, oprettet_navn
-            FROM markbetalinger 
-            ORDER BY betalingsdato DESC
-        """)
-        betalinger = []
-        for row in cursor.fetchall():
-            betaling = {
-                "id": row[0], "navn": row[1], "telefon": row[2], 
-                "tidsperiode": row[3], "betalingsdato": row[4], 
-                "udlobsdato": row[5], "oprettet_af": row[6], 
-                "oprettet_navn": row[7]
-            }
-            betalinger.append(betaling)
-        conn.close()
-        return betalinger
-    except Exception as e:
-        print(f"Fejl ved hentning af markbetalinger: {e}")
-        return []
+#     """Get all markbetalinger from database"""
+#     try:
+#         conn = sqlite3.connect(DB_PATH)
+#         cursor = conn.cursor()
+#         cursor.execute("""
+#             SELECT id, navn, telefon, tidsperiode, betalingsdato, udlobsdato, 
+#                    oprettet_af, oprettet_navn
+#             FROM markbetalinger 
+#             ORDER BY betalingsdato DESC
+#         """)
+#         betalinger = []
+#         for row in cursor.fetchall():
+#             betaling = {
+#                 "id": row[0], "navn": row[1], "telefon": row[2], 
+#                 "tidsperiode": row[3], "betalingsdato": row[4], 
+#                 "udlobsdato": row[5], "oprettet_af": row[6], 
+#                 "oprettet_navn": row[7]
+#             }
+#             betalinger.append(betaling)
+#         conn.close()
+#         return betalinger
+#     except Exception as e:
+#         print(f"Fejl ved hentning af markbetalinger: {e}")
+#         return []
 
 # def add_markbetaling(betaling_data):
-    """Add markbetaling to database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Beregn udløbsdato baseret på tidsperiode
-        betalingsdato = datetime.now()
-        tidsperiode = betaling_data["tidsperiode"]
-        
-        if tidsperiode == "24 timer":
-            udlobsdato = betalingsdato + timedelta(days=1)
-        elif tidsperiode == "3 døgn":
-            udlobsdato = betalingsdato + timedelta(days=3)
-        elif tidsperiode == "1 uge":
-            udlobsdato = betalingsdato + timedelta(days=7)
-        else:
-            udlobsdato = betalingsdato + timedelta(days=1)  # Default
-        
-        cursor.execute("""
-            INSERT INTO markbetalinger 
-            (navn, telefon, tidsperiode, betalingsdato, udlobsdato, oprettet_af, oprettet_navn)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            betaling_data["navn"], 
-            betaling_data["telefon"],
-            betaling_data["tidsperiode"],
-            betalingsdato.strftime("%Y-%m-%d %H:%M:%S"),
-            udlobsdato.strftime("%Y-%m-%d %H:%M:%S"),
-            betaling_data["oprettet_af"],
-            betaling_data["oprettet_navn"]
-        ))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Fejl ved tilføjelse af markbetaling: {e}")
-        return False
+#     """Add markbetaling to database"""
+#     try:
+#         conn = sqlite3.connect(DB_PATH)
+#         cursor = conn.cursor()
+#         
+#         # Beregn udløbsdato baseret på tidsperiode
+#         betalingsdato = datetime.now()
+#         tidsperiode = betaling_data["tidsperiode"]
+#         
+#         if tidsperiode == "24 timer":
+#             udlobsdato = betalingsdato + timedelta(days=1)
+#         elif tidsperiode == "3 døgn":
+#             udlobsdato = betalingsdato + timedelta(days=3)
+#         elif tidsperiode == "1 uge":
+#             udlobsdato = betalingsdato + timedelta(days=7)
+#         else:
+#             udlobsdato = betalingsdato + timedelta(days=1)  # Default
+#         
+#         cursor.execute("""
+#             INSERT INTO markbetalinger 
+#             (navn, telefon, tidsperiode, betalingsdato, udlobsdato, oprettet_af, oprettet_navn)
+#             VALUES (?, ?, ?, ?, ?, ?, ?)
+#         """, (
+#             betaling_data["navn"], 
+#             betaling_data["telefon"],
+#             betaling_data["tidsperiode"],
+#             betalingsdato.strftime("%Y-%m-%d %H:%M:%S"),
+#             udlobsdato.strftime("%Y-%m-%d %H:%M:%S"),
+#             betaling_data["oprettet_af"],
+#             betaling_data["oprettet_navn"]
+#         ))
+#         
+#         conn.commit()
+#         conn.close()
+#         return True
+#     except Exception as e:
+#         print(f"Fejl ved tilføjelse af markbetaling: {e}")
+#         return False
+
+@bot.event
+async def setup_hook():
+    """Åbn databasen og registrer persistente views og dynamiske knapper før gateway forbindelsen,
+    så knapper på eksisterende beskeder virker igen efter en genstart"""
+    # Fejler migrationerne eller plan checket stopper opstarten her, før botten går online
+    startup_timings.clear()
+    await timed_startup_phase("database", db.init())
+    await timed_startup_phase("job store", job_store.load())
+    
+    outbound.start()
+    bot.add_view(MedlemView())
+    bot.add_view(AdminControlView())
+    bot.add_dynamic_items(
+        TakeJobButton,
+        PermanentJobButton,
+        BoardPageButton,
+        CancelJobButton,
+        CompleteJobButton,
+        ForceCloseJobButton,
+        CompletePermanentJobButton,
+        ClosePermanentJobButton,
+        ForceClosePermanentJobButton,
+    )
 
 @bot.event
 async def on_ready():
+    """Kaldes ved første forbindelse og igen efter hver gateway reconnect"""
+    global bootstrapped
     print(f"Prospect/Supporter Bot er online som {bot.user}")
     
-    # Set bot avatar/logo
+    async with bootstrap_lock:
+        if not bootstrapped:
+            await bootstrap()
+            bootstrapped = True
+        else:
+            await resume_after_reconnect()
+
+async def bootstrap():
+    """Engangs opstart efter forbindelsen: rolle indeks, kanaler og baggrundsopgaver
+    (databasen og job storen er allerede indlæst i setup_hook)"""
+    started = time.perf_counter()
+    
+    # Set bot avatar/logo og sync slash commands - begge springes over hvis intet er ændret
+    await timed_startup_phase("avatar", sync_bot_avatar())
+    await timed_startup_phase("slash commands", sync_slash_commands())
+    
+    # Byg rolle indeks fra member cachen (holdes derefter opdateret af member events)
+    role_index.build(member for guild in bot.guilds for member in guild.members)
+    member_event_queue.start()
+    await timed_startup_phase("admin liste", load_admin_roster())
+    await timed_startup_phase("ranglister", load_leaderboards())
+    
+    # Setup kanaler samtidigt - en fejl i én kanal blokerer ikke de andre
+    await timed_startup_phase("kanaler", setup_all_channels())
+    
+    # Fyld puljen af forud oprettede private kanaler
+    channel_pool.start()
+    job_archive.start()
+    
+    # Kontrol panelerne er persistente - de skal kun udskiftes én gang fra det gamle format
+    if await db.get_setting("kontrol_panel_version", "1") != KONTROL_PANEL_VERSION:
+        update_all_private_channel_buttons()
+        await db.set_setting("kontrol_panel_version", KONTROL_PANEL_VERSION)
+    
+    # Start periodisk check som backup
+    if not periodic_stats_check.is_running():
+        periodic_stats_check.start()
+    
+    print_startup_timings(time.perf_counter() - started)
+
+async def resume_after_reconnect():
+    """Let genoptagelse efter reconnect - afstem kun det der kan være drevet under afbrydelsen"""
+    started = time.perf_counter()
+    
+    # Rolle ændringer mens vi var afbrudt kom aldrig som events - byg indekset fra den nye cache
+    role_index.build(member for guild in bot.guilds for member in guild.members)
+    member_event_queue.start()
+    admin_roster.set_admins(role_index.members_with_any(ADMIN_ROLLE_IDS))
+    await prune_stale_permanent_sessions()
+    leaderboards.rebuild()
+    await ensure_all_prospect_supporters_in_stats()
+    
+    # Renderne er diff-baserede, så uændrede beskeder koster ingen API kald
+    refresh_scheduler.mark_dirty("board")
+    refresh_scheduler.mark_dirty("stats")
+    
+    if not periodic_stats_check.is_running():
+        periodic_stats_check.start()
+    
+    print(f"🔁 Genoptaget efter reconnect på {time.perf_counter() - started:.2f}s")
+
+async def timed_startup_phase(name, coro):
+    """Kør en opstartsfase og gem hvor lang tid den tog og om den fejlede"""
+    start = time.perf_counter()
+    error = None
+    try:
+        return await coro
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        startup_timings.append((name, time.perf_counter() - start, error))
+
+async def setup_channel(name, setup):
+    """Setup én kanal inden for det fælles rate limit budget - fejl logges og sluges"""
+    async with kanal_setup_budget:
+        try:
+            await timed_startup_phase(name, setup())
+        except Exception as e:
+            print(f"❌ Fejl under setup af {name}: {e}")
+
+async def setup_all_channels():
+    """Setup alle faste kanaler samtidigt som separate tasks"""
+    await asyncio.gather(
+        setup_channel("job board kanal", setup_prospect_supporter_kanal),
+        setup_channel("opgave oprettelse kanal", setup_opgave_oprettelse_kanal),
+        setup_channel("stats kanal", setup_prospect_supporter_stats_kanal),
+        setup_channel("admin panel kanal", setup_admin_panel_kanal),
+        # setup_channel("markbetalinger kanal", setup_markbetalinger_kanal),  # Disabled
+    )
+
+def print_startup_timings(total):
+    """Udskriv varigheden og status af hver opstartsfase"""
+    failed = sum(1 for _, _, error in startup_timings if error)
+    print(f"⏱️ Opstart færdig på {total:.2f}s ({failed} fejl):")
+    for name, duration, error in startup_timings:
+        status = f"❌ {error}" if error else "✅"
+        print(f"   • {name}: {duration:.2f}s {status}")
+
+async def sync_bot_avatar():
+    """Upload logoet som bot avatar - kun hvis det er ændret siden sidste upload"""
     try:
         import aiohttp
         async with aiohttp.ClientSession() as session:
             async with session.get(LOGO_URL) as response:
-                if response.status == 200:
-                    avatar_data = await response.read()
-                    await bot.user.edit(avatar=avatar_data)
-                    print("✅ Bot avatar opdateret med Red Devils logo")
-                else:
+                if response.status != 200:
                     print("⚠️ Kunne ikke hente logo til bot avatar")
+                    return
+                avatar_data = await response.read()
+        
+        avatar_hash = hashlib.sha256(avatar_data).hexdigest()
+        if bot.user.avatar is not None and await db.get_setting("avatar_hash") == avatar_hash:
+            print("⏭️ Bot avatar er uændret - upload sprunget over")
+            return
+        
+        await bot.user.edit(avatar=avatar_data)
+        await db.set_setting("avatar_hash", avatar_hash)
+        print("✅ Bot avatar opdateret med Red Devils logo")
     except Exception as e:
         print(f"⚠️ Fejl ved opdatering af bot avatar: {e}")
-    
-    # Sync slash commands
+
+def command_tree_hash():
+    """Hash af den lokale slash command definition (det der ville blive sendt ved sync)"""
+    payload = json.dumps([command.to_dict(bot.tree) for command in bot.tree.get_commands()],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+async def sync_slash_commands():
+    """Sync slash commands - kun hvis kommando træet er ændret siden sidste sync"""
     try:
+        tree_hash = command_tree_hash()
+        if await db.get_setting("command_tree_hash") == tree_hash:
+            print("⏭️ Slash commands er uændrede - sync sprunget over")
+            return
+        
         synced = await bot.tree.sync()
+        await db.set_setting("command_tree_hash", tree_hash)
         print(f"✅ Synced {len(synced)} slash commands")
     except Exception as e:
         print(f"❌ Failed to sync slash commands: {e}")
-    
-    # Initialize database
-    init_database()
-    
-    # Setup kanaler
-    await setup_prospect_supporter_kanal()
-    await setup_opgave_oprettelse_kanal()
-    await setup_prospect_supporter_stats_kanal()
-    await setup_admin_panel_kanal()
-    # await setup_markbetalinger_kanal()  # Disabled
-    
-    # Start periodisk check som backup
-    periodic_stats_check.start()
+
+@bot.listen("on_message")
+async def track_bot_message(message):
+    """Registrer alle beskeder botten sender i besked indekset"""
+    if message.author == bot.user and message.guild is not None:
+        await message_index.track(message)
 
 @bot.event
-async def on_member_update(before, after):
-    """Opdater prospect_supporter stats når medlemmer får/mister prospect_supporter rollen"""
+async def on_raw_message_delete(payload):
+    await message_index.forget([payload.message_id])
+
+@bot.event
+async def on_raw_bulk_message_delete(payload):
+    await message_index.forget(payload.message_ids)
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    """Private kanaler slettes løbende - glem deres beskeder og afslut evt. permanent session"""
+    await message_index.forget_channel(channel.id)
+    if admin_roster.end_session(channel.id) is not None:
+        await db.remove_permanent_session(channel.id)
+
+async def load_admin_roster():
+    """Byg admin listen med gemte sessioner og fraværs markeringer"""
+    admin_roster.set_admins(role_index.members_with_any(ADMIN_ROLLE_IDS))
+    admin_roster.load_sessions(await prune_stale_permanent_sessions())
     try:
-        # Debug: Log alle rolle ændringer
-        print(f"🔍 Member update detected for {after.display_name}")
-        
-        # Tjek om prospect_supporter rollen er ændret
-        before_has_role = any(role.id in PROSPECT_SUPPORTER_ROLLE_IDS for role in before.roles)
-        after_has_role = any(role.id in PROSPECT_SUPPORTER_ROLLE_IDS for role in after.roles)
-        
-        print(f"🔍 Prospect/Supporter rolle check: {before_has_role} → {after_has_role}")
-        
-        # Hvis prospect_supporter rollen er ændret
-        if before_has_role != after_has_role:
-            print(f"🔄 PUSHER ROLLE ÆNDRET for {after.display_name}: {before_has_role} → {after_has_role}")
-            
-            # Vent lidt for at sikre Discord har opdateret
-            await asyncio.sleep(2)
-            
-            # Opdater stats kanal automatisk
-            stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-            if stats_kanal:
-                await update_prospect_supporter_stats_embed(stats_kanal)
-                print(f"✅ OPDATEREDE prospect_supporter stats efter rolle ændring for {after.display_name}")
-            else:
-                print(f"⚠️ Stats kanal ikke fundet!")
-    except Exception as e:
-        print(f"❌ Fejl i on_member_update: {e}")
+        admin_roster.set_opted_out(json.loads(await db.get_setting("admin_fravaer", "[]")))
+    except ValueError:
+        admin_roster.set_opted_out([])
+
+async def prune_stale_permanent_sessions():
+    """Fjern sessioner hvis kanal blev slettet mens botten var offline - returnerer de levende"""
+    sessions = await db.get_permanent_sessions()
+    live = []
+    for channel_id, admin_id in sessions:
+        if bot.get_channel(channel_id) is not None:
+            live.append((channel_id, admin_id))
+            continue
+        await db.remove_permanent_session(channel_id)
+        admin_roster.end_session(channel_id)
+    if len(live) < len(sessions):
+        print(f"🧹 Fjernede {len(sessions) - len(live)} permanente sessioner uden kanal")
+    return live
+
+def admin_available(guild, admin_id):
+    """Admin er på serveren og - hvis presence data er slået til - ikke offline"""
+    member = guild.get_member(admin_id)
+    if member is None:
+        return False
+    if bot.intents.presences and member.status == discord.Status.offline:
+        return False
+    return True
+
+def tracked_role_ids(member):
+    """De rolle IDs på et member som rolle indekset holder øje med"""
+    return frozenset(role.id for role in member.roles) & role_index.tracked_role_ids
+
+@bot.event
+async def on_member_update(before, after):
+    """Læg relevante rolle/navne ændringer i member event køen"""
+    before_roles = tracked_role_ids(before)
+    after_roles = tracked_role_ids(after)
+    
+    # Billigt filter: nickname, avatar, boost osv. er kun relevante hvis navnet vises i stats
+    if before_roles == after_roles and (not after_roles or before.display_name == after.display_name):
+        member_event_queue.filtered()
+        return
+    
+    member_event_queue.put(after.id, after_roles, after.display_name)
 
 @bot.event
 async def on_member_remove(member):
     """Opdater prospect_supporter stats når et medlem forlader serveren"""
-    # Tjek om medlemmet havde prospect_supporter rollen
-    had_prospect_supporter_role = any(role.id in PROSPECT_SUPPORTER_ROLLE_IDS for role in member.roles)
+    if not tracked_role_ids(member):
+        member_event_queue.filtered()
+        return
     
-    if had_prospect_supporter_role:
-        print(f"👋 Prospect/Supporter {member.display_name} forlod serveren")
-        
-        # Opdater stats kanal automatisk
-        stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-        if stats_kanal:
-            # Vent lidt så Discord opdaterer rolle listen
-            await asyncio.sleep(1)
-            await update_prospect_supporter_stats_embed(stats_kanal)
-            print(f"✅ Opdaterede prospect_supporter stats efter {member.display_name} forlod serveren")
+    member_event_queue.put(member.id, ())
 
 @bot.event
 async def on_member_join(member):
     """Potentielt opdater prospect_supporter stats hvis ny medlem får prospect_supporter rolle hurtigt"""
-    # Denne event trigger ikke stats opdatering med det samme,
+    # Denne event trigger normalt ikke stats opdatering,
     # men on_member_update vil fange det når de får rollen
-    pass
+    if not tracked_role_ids(member):
+        member_event_queue.filtered()
+        return
+    
+    member_event_queue.put(member.id, tracked_role_ids(member), member.display_name)
+
+async def apply_member_event_batch(batch, resync):
+    """Anvend en batch af kollapsede rolle ændringer - højst én stats opdatering per batch"""
+    prospect_supporter_roller = frozenset(PROSPECT_SUPPORTER_ROLLE_IDS)
+    stats_changed = False
+    stats_member_ids = set()  # Members hvis række i statistik tabellen skal synkroniseres
+    
+    if resync:
+        # Køen er løbet over - byg indekset forfra fra member cachen
+        role_index.build(member for guild in bot.guilds for member in guild.members)
+        leaderboards.rebuild()
+        await ensure_all_prospect_supporters_in_stats()
+        stats_changed = True
+    else:
+        for member_id, (role_ids, display_name) in batch.items():
+            old_name = role_index.name(member_id, None)
+            changed_roles = role_index.set_member_roles(member_id, role_ids, display_name)
+            if changed_roles:
+                leaderboards.sync_member(member_id)
+            if changed_roles & prospect_supporter_roller:
+                stats_changed = True
+                stats_member_ids.add(member_id)
+            elif role_ids & prospect_supporter_roller and display_name != old_name:
+                stats_changed = True
+                stats_member_ids.add(member_id)
+        if stats_member_ids:
+            await ensure_all_prospect_supporters_in_stats(stats_member_ids)
+    
+    if stats_changed:
+        # Opdater stats kanal automatisk
+        refresh_scheduler.mark_dirty("stats")
+    
+    # Hold admin listen i takt med admin rollerne
+    admin_roster.set_admins(role_index.members_with_any(ADMIN_ROLLE_IDS))
+    
+    stats = member_event_queue.stats
+    print(f"🔄 Member events: {len(batch)} members i batch{' (fuld resync)' if resync else ''} - "
+          f"modtaget {stats['received']}, filtreret {stats['filtered']}, "
+          f"kollapset {stats['coalesced']}, droppet {stats['dropped']}")
 
 async def setup_prospect_supporter_kanal():
     """Setup prospect_supporter kanal med job oversigt"""
@@ -623,15 +525,17 @@ async def setup_prospect_supporter_kanal():
         print(f"⚠️ Prospect/Supporter kanal med ID {OPGAVE_KANAL_ID} ikke fundet.")
         return
     
-    try:
-        # Clear channel
-        await kanal.purge()
-        print(f"🧹 Prospect/Supporter kanal {kanal.name} er ryddet.")
-    except Exception as e:
-        print(f"❌ Fejl under rydning af prospect_supporter kanal: {e}")
+    # Ryd kun kanalen hvis vi ikke allerede kender board beskederne
+    if not await board_renderer.load_state():
+        try:
+            # Clear channel
+            await kanal.purge()
+            print(f"🧹 Prospect/Supporter kanal {kanal.name} er ryddet.")
+        except Exception as e:
+            print(f"❌ Fejl under rydning af prospect_supporter kanal: {e}")
     
-    # Send prospect_supporter embed
-    await send_prospect_supporter_embed(kanal)
+    # Send/opdater prospect_supporter embed
+    await refresh_scheduler.flush("board")
 
 async def setup_opgave_oprettelse_kanal():
     """Setup opgave oprettelses kanal med knap til at oprette jobs"""
@@ -640,15 +544,17 @@ async def setup_opgave_oprettelse_kanal():
         print(f"⚠️ Opgave oprettelses kanal med ID {OPGAVE_OPRETTELSES_KANAL_ID} ikke fundet.")
         return
     
-    try:
-        # Clear channel
-        await kanal.purge()
-        print(f"🧹 Medlem kanal {kanal.name} er ryddet.")
-    except Exception as e:
-        print(f"❌ Fejl under rydning af medlem kanal: {e}")
+    # Ryd kun kanalen hvis vi ikke allerede kender beskeden - knappen er persistent
+    if not await oprettelse_renderer.load_state():
+        try:
+            # Clear channel
+            await kanal.purge()
+            print(f"🧹 Medlem kanal {kanal.name} er ryddet.")
+        except Exception as e:
+            print(f"❌ Fejl under rydning af medlem kanal: {e}")
     
-    # Send opgave oprettelse embed
-    await send_opgave_oprettelse_embed(kanal)
+    # Send/opdater opgave oprettelse embed
+    await render_static_panel(kanal, oprettelse_renderer, [build_opgave_oprettelse_section()])
 
 class ProspectSupporterJobView(View):
     def __init__(self):
@@ -658,7 +564,7 @@ class MedlemView(View):
     def __init__(self):
         super().__init__(timeout=None)
 
-    @discord.ui.button(label="➕ Opret Opgave", style=discord.ButtonStyle.primary, emoji="📝")
+    @discord.ui.button(label="➕ Opret Opgave", style=discord.ButtonStyle.primary, emoji="📝", custom_id="medlem_opret_opgave")
     async def opret_opgave(self, interaction: discord.Interaction, button: Button):
         # Tjek om brugeren har en af medlem rollerne
         if not tjek_medlem_rolle(interaction.user):
@@ -787,7 +693,7 @@ class AdminControlView(View):
     def __init__(self):
         super().__init__(timeout=None)
 
-    @discord.ui.button(label="➕ Tilføj Permanent Opgave", style=discord.ButtonStyle.primary, emoji="🔄")
+    @discord.ui.button(label="➕ Tilføj Permanent Opgave", style=discord.ButtonStyle.primary, emoji="🔄", custom_id="admin_perm_add")
     async def add_permanent_job(self, interaction: discord.Interaction, button: Button):
         if not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan bruge denne funktion!", ephemeral=True)
@@ -795,37 +701,37 @@ class AdminControlView(View):
         
         await interaction.response.send_modal(AddPermOpgaveModal())
 
-    @discord.ui.button(label="✏️ Rediger Permanent Opgave", style=discord.ButtonStyle.secondary, emoji="📝")
+    @discord.ui.button(label="✏️ Rediger Permanent Opgave", style=discord.ButtonStyle.secondary, emoji="📝", custom_id="admin_perm_edit")
     async def edit_permanent_job(self, interaction: discord.Interaction, button: Button):
         if not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan bruge denne funktion!", ephemeral=True)
             return
         
-        permanent_jobs = get_permanent_jobs()
+        permanent_jobs = job_store.permanent_jobs()
         if not permanent_jobs:
             await interaction.response.send_message("⛔ Ingen permanente opgaver at redigere!", ephemeral=True)
             return
         
         view = View()
-        view.add_item(EditPermOpgaveSelect())
+        view.add_item(EditPermOpgaveSelect(permanent_jobs))
         await interaction.response.send_message("Vælg opgave at redigere:", view=view, ephemeral=True)
 
-    @discord.ui.button(label="🗑️ Fjern Permanent Opgave", style=discord.ButtonStyle.danger, emoji="❌")
+    @discord.ui.button(label="🗑️ Fjern Permanent Opgave", style=discord.ButtonStyle.danger, emoji="❌", custom_id="admin_perm_remove")
     async def remove_permanent_job(self, interaction: discord.Interaction, button: Button):
         if not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan bruge denne funktion!", ephemeral=True)
             return
         
-        permanent_jobs = get_permanent_jobs()
+        permanent_jobs = job_store.permanent_jobs()
         if not permanent_jobs:
             await interaction.response.send_message("⛔ Ingen permanente opgaver at fjerne!", ephemeral=True)
             return
         
         view = View()
-        view.add_item(RemovePermOpgaveSelect())
+        view.add_item(RemovePermOpgaveSelect(permanent_jobs))
         await interaction.response.send_message("Vælg opgave at fjerne:", view=view, ephemeral=True)
 
-    @discord.ui.button(label="🗑️ Slet Medlem Opgave", style=discord.ButtonStyle.danger, emoji="📋")
+    @discord.ui.button(label="🗑️ Slet Medlem Opgave", style=discord.ButtonStyle.danger, emoji="📋", custom_id="admin_member_job_delete")
     async def delete_member_job(self, interaction: discord.Interaction, button: Button):
         if not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan bruge denne funktion!", ephemeral=True)
@@ -834,7 +740,7 @@ class AdminControlView(View):
         # Send modal til at indtaste opgave nummer
         await interaction.response.send_modal(DeleteMemberJobModal())
 
-    @discord.ui.button(label="⚠️ NULSTIL SYSTEM", style=discord.ButtonStyle.danger, emoji="🗑️")
+    @discord.ui.button(label="⚠️ NULSTIL SYSTEM", style=discord.ButtonStyle.danger, emoji="🗑️", custom_id="admin_reset_system")
     async def reset_system(self, interaction: discord.Interaction, button: Button):
         if not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan bruge denne funktion!", ephemeral=True)
@@ -864,13 +770,13 @@ class DeleteMemberJobModal(Modal):
             return
         
         # Find jobbet
-        job = get_member_job_by_number(job_number)
+        job = job_store.get_member_job_by_number(job_number)
         if not job:
             await interaction.response.send_message(f"⛔ Ingen opgave fundet med nummer **{job_number}**!", ephemeral=True)
             return
         
         # Slet jobbet
-        success, privat_kanal_id = delete_member_job_by_id(job["id"])
+        success, privat_kanal_id = await job_store.delete_member_job_by_id(job["id"])
         
         if success:
             # Luk privat kanal hvis den eksisterer (uden at sende besked)
@@ -884,9 +790,7 @@ class DeleteMemberJobModal(Modal):
                         pass
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
             
             embed = discord.Embed(
                 title="✅ Opgave Slettet",
@@ -919,23 +823,17 @@ class ResetSystemModal(Modal):
             await interaction.response.send_message("⛔ Bekræftelse fejlede! Skriv 'NULSTIL' for at bekræfte.", ephemeral=True)
             return
         
+        # Kvitter først - nulstillingen og renders kan tage længere end Discords 3 sekunder
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
             # Clear all tables except permanent_jobs
-            cursor.execute("DELETE FROM member_jobs")
-            cursor.execute("DELETE FROM completed_jobs")
-            cursor.execute("DELETE FROM prospect_supporter_stats")
-            cursor.execute("UPDATE settings SET value = '1' WHERE key = 'job_counter'")
-            
-            conn.commit()
-            conn.close()
+            await job_store.reset_jobs_and_stats()
+            leaderboards.clear()
             
-            # Opdater kanaler
-            await setup_prospect_supporter_kanal()
-            await setup_opgave_oprettelse_kanal()
-            await setup_prospect_supporter_stats_kanal()
+            # Opdater kanaler i baggrunden via refresh scheduleren
+            refresh_scheduler.mark_dirty("board")
+            refresh_scheduler.mark_dirty("stats")
             
             embed = discord.Embed(
                 title="✅ System Nulstillet",
@@ -943,10 +841,10 @@ class ResetSystemModal(Modal):
                 color=0x00FF00
             )
             embed.set_thumbnail(url=LOGO_URL)
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except Exception as e:
-            await interaction.response.send_message(f"⛔ Fejl ved nulstilling: {e}", ephemeral=True)
+            await interaction.followup.send(f"⛔ Fejl ved nulstilling: {e}", ephemeral=True)
 
 
 
@@ -981,16 +879,8 @@ class OpretOpgaveModal(Modal):
         self.add_item(self.belonning)
 
     async def on_submit(self, interaction: discord.Interaction):
-        # Get next job counter from database
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT value FROM settings WHERE key = 'job_counter'")
-        job_counter = int(cursor.fetchone()[0])
-        job_id = f"job_{job_counter}"
-        conn.close()
-        
+        # Job id og nummer tildeles af databasen
         ny_opgave = {
-            "id": job_id,
             "titel": self.opgave_titel.value,
             "beskrivelse": self.opgave_beskrivelse.value,
             "belonning": self.belonning.value if self.belonning.value else "Ikke angivet",
@@ -999,13 +889,11 @@ class OpretOpgaveModal(Modal):
             "oprettet_navn": interaction.user.display_name
         }
         
-        if add_member_job(ny_opgave):
+        if await job_store.add_member_job(ny_opgave):
             await interaction.response.send_message("✅ Din opgave er blevet oprettet og sendt til prospect_supporterne!", ephemeral=True)
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
         else:
             await interaction.response.send_message("⛔ Fejl ved oprettelse af opgave!", ephemeral=True)
 
@@ -1039,20 +927,16 @@ class CompleteJobModal(Modal):
             return
         
         # Marker job som færdigt med points
-        if complete_member_job_with_points(self.job_id, point_reward):
+        if await job_store.complete_member_job_with_points(self.job_id, point_reward):
             if point_reward > 0:
                 await interaction.response.send_message(f"🎉 Jobbet er markeret som færdigt! **{point_reward} point** tildelt. Godt arbejde!", ephemeral=False)
             else:
                 await interaction.response.send_message("🎉 Jobbet er markeret som færdigt! Godt arbejde!", ephemeral=False)
             
             # Opdater prospect_supporter kanal og stats
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
             
-            stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-            if stats_kanal:
-                await update_prospect_supporter_stats_embed(stats_kanal)
+            refresh_scheduler.mark_dirty("stats")
             
             # Slet den private kanal efter 10 sekunder
             await asyncio.sleep(10)
@@ -1063,8 +947,8 @@ class CompleteJobModal(Modal):
         else:
             await interaction.response.send_message("⛔ Fejl ved færdiggørelse af job!", ephemeral=True)
 
-async def send_prospect_supporter_embed(kanal):
-    """Send prospect_supporter embed med alle jobs"""
+def build_main_board_embed(member_jobs):
+    """Byg prospect_supporter hoved embed"""
     embed = discord.Embed(
         title="🎯 Red Devils Prospect/Supporter System",
         description="**Oversigt over alle tilgængelige jobs og opgaver**",
@@ -1072,9 +956,6 @@ async def send_prospect_supporter_embed(kanal):
     )
     embed.set_thumbnail(url=LOGO_URL)
     
-    # Permanente opgaver
-    permanent_jobs = get_permanent_jobs()
-    
     embed.add_field(
         name="🔄 Permanente Opgaver",
         value="Se nummererede permanente opgaver nedenfor",
@@ -1082,7 +963,6 @@ async def send_prospect_supporter_embed(kanal):
     )
     
     # Medlems opgaver
-    member_jobs = get_member_jobs()
     embed.add_field(
         name="📋 Vigtige Opgaver",
         value="Se medlems opgaver nedenfor" if member_jobs else "```\nIngen opgaver lige nu\n```",
@@ -1091,217 +971,277 @@ async def send_prospect_supporter_embed(kanal):
     
     embed.add_field(
         name="ℹ️ Information",
-        value="Tryk på nummerknapperne for at tage opgaver. Permanente opgaver opretter admin-prospect_supporter kanal.",
+        value="Tryk på nummerknapperne for at tage opgaver. Permanente opgaver opretter admin-prospect_supporter kanal. "
+              "Brug ◀️/▶️ for at se flere opgaver - siderne vises kun for dig.",
         inline=False
     )
     
     embed.set_footer(text="Red Devils Prospect/Supporter System v1.0")
     embed.timestamp = datetime.now()
+    return embed
+
+def build_board_sections():
+    """Byg de faste sektioner i prospect_supporter kanalen - altid samme antal beskeder.
+    Kun første side vises offentligt; resten bladres igennem ephemeralt per bruger."""
+    permanent_jobs = job_store.permanent_jobs()
+    member_jobs = job_store.member_jobs()
     
-    # Send main embed (denne gemmes og opdateres ikke)
-    main_msg = await kanal.send(embed=embed)
-    
-    # Send permanent jobs med knapper
-    await send_permanent_jobs_section(kanal, permanent_jobs)
-    
-    # Send member jobs (opdeles hvis nødvendigt)
-    if member_jobs:
-        await send_member_jobs_sections(kanal, member_jobs)
-    
-    return main_msg
+    sections = [{"embed": build_main_board_embed(member_jobs)}]
+    sections.append(dict(zip(("embed", "view"), build_permanent_jobs_page(permanent_jobs, 1))))
+    sections.append(dict(zip(("embed", "view"), build_member_jobs_page(member_jobs, 1))))
+    return sections
 
-async def send_permanent_jobs_section(kanal, permanent_jobs):
-    """Send permanent jobs med nummererede knapper"""
-    if not permanent_jobs:
-        return
+def page_count(total, per_side):
+    return max(1, -(-total // per_side))
+
+def build_permanent_jobs_page(permanent_jobs, side):
+    """Byg (embed, view) for én side af de permanente opgaver med nummerknapper"""
+    sider = page_count(len(permanent_jobs), BOARD_PERMANENTE_PER_SIDE)
+    side = min(max(side, 1), sider)
+    first = (side - 1) * BOARD_PERMANENTE_PER_SIDE
+    page_jobs = permanent_jobs[first:first + BOARD_PERMANENTE_PER_SIDE]
     
     # Opret permanent jobs tekst med numre
     perm_text = ""
-    for i, job in enumerate(permanent_jobs, 1):
+    for i, job in enumerate(page_jobs, first + 1):
         perm_text += f"**#{i}** {job}\n"
     
     perm_embed = discord.Embed(
-        title="🔄 Permanente Opgaver",
-        description=perm_text,
+        title="🔄 Permanente Opgaver" + (f" (Side {side}/{sider})" if sider > 1 else ""),
+        description=perm_text or "Ingen permanente opgaver lige nu",
         color=0x5865F2
     )
     
-    await kanal.send(embed=perm_embed)
-    
-    # Opret knapper for permanente jobs
-    perm_view = await create_permanent_job_buttons_view(permanent_jobs)
-    if perm_view.children:
-        await kanal.send("**Permanente opgaver:**", view=perm_view)
-
-async def send_member_jobs_sections(kanal, member_jobs):
-    """Send member jobs opdelt i sektioner af max 8"""
-    JOBS_PER_SECTION = 8
-    
-    # Opdel jobs i grupper af 8
-    for i in range(0, len(member_jobs), JOBS_PER_SECTION):
-        section_jobs = member_jobs[i:i + JOBS_PER_SECTION]
-        section_number = (i // JOBS_PER_SECTION) + 1
-        
-        # Opret embed for denne sektion
-        member_jobs_text = ""
-        for job in section_jobs:
-            status_emoji = "🟢" if job["status"] == "ledig" else "🔴"
-            job_number = job.get("job_number", "?")
-            member_jobs_text += f"**#{job_number}** {status_emoji} **{job['titel']}**\n"
-            member_jobs_text += f"       📝 {job['beskrivelse'][:50]}{'...' if len(job['beskrivelse']) > 50 else ''}\n"
-            member_jobs_text += f"       💰 {job['belonning']}\n"
-            member_jobs_text += f"       👤 Af: {job['oprettet_navn']}\n"
-            if job["status"] == "optaget":
-                member_jobs_text += f"       🎯 Prospect/Supporter: {job['prospect_supporter_navn']}\n"
-            member_jobs_text += "\n"
-        
-        # Member jobs embed for denne sektion
-        title = f"📋 Vigtige Opgaver (Del {section_number})" if len(member_jobs) > JOBS_PER_SECTION else "📋 Vigtige Opgaver"
-        member_embed = discord.Embed(
-            title=title,
-            description=member_jobs_text,
-            color=0x57F287
-        )
-        
-        await kanal.send(embed=member_embed)
+    # Opret knapper for permanente jobs på denne side
+    perm_view = create_permanent_job_buttons_view(range(first + 1, first + len(page_jobs) + 1))
+    add_page_buttons(perm_view, "permanent", side, sider)
+    return perm_embed, perm_view if perm_view.children else None
+
+def build_member_jobs_page(member_jobs, side):
+    """Byg (embed, view) for én side af medlemmernes jobs"""
+    sider = page_count(len(member_jobs), BOARD_MEDLEM_JOBS_PER_SIDE)
+    side = min(max(side, 1), sider)
+    first = (side - 1) * BOARD_MEDLEM_JOBS_PER_SIDE
+    page_jobs = member_jobs[first:first + BOARD_MEDLEM_JOBS_PER_SIDE]
+    
+    member_jobs_text = ""
+    for job in page_jobs:
+        status_emoji = "🟢" if job["status"] == "ledig" else "🔴"
+        job_number = job.get("job_number", "?")
+        member_jobs_text += f"**#{job_number}** {status_emoji} **{job['titel']}**\n"
+        member_jobs_text += f"       📝 {job['beskrivelse'][:50]}{'...' if len(job['beskrivelse']) > 50 else ''}\n"
+        member_jobs_text += f"       💰 {job['belonning']}\n"
+        member_jobs_text += f"       👤 Af: {job['oprettet_navn']}\n"
+        if job["status"] == "optaget":
+            member_jobs_text += f"       🎯 Prospect/Supporter: {job['prospect_supporter_navn']}\n"
+        member_jobs_text += "\n"
+    
+    member_embed = discord.Embed(
+        title="📋 Vigtige Opgaver" + (f" (Side {side}/{sider})" if sider > 1 else ""),
+        description=member_jobs_text or "Ingen opgaver lige nu",
+        color=0x57F287
+    )
+    
+    # Opret knapper for denne side
+    member_view = create_member_job_buttons_view(page_jobs)
+    add_page_buttons(member_view, "medlem", side, sider)
+    return member_embed, member_view if member_view.children else None
+
+def add_page_buttons(view, liste, side, sider):
+    """Tilføj forrige/næste knapper i nederste række hvis der er mere end én side"""
+    if sider > 1:
+        view.add_item(BoardPageButton(liste, side - 1, "◀️ Forrige", disabled=side <= 1))
+        view.add_item(BoardPageButton(liste, side + 1, "Næste ▶️", disabled=side >= sider))
+
+class BoardPageButton(discord.ui.DynamicItem[Button], template=r"board_side:(?P<liste>medlem|permanent):(?P<side>\d+)"):
+    """Bladreknap på job boardet - siden vises ephemeralt, så hver bruger har sin egen side.
+    Målsiden ligger i custom_id, så knappen virker efter genstart uden gemt tilstand."""
+    def __init__(self, liste, side, label="Side", disabled=False):
+        super().__init__(Button(
+            label=label,
+            style=discord.ButtonStyle.primary,
+            custom_id=f"board_side:{liste}:{side}",
+            disabled=disabled,
+            row=4
+        ))
+        self.liste = liste
+        self.side = side
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["liste"], int(match["side"]), item.label)
+
+    async def callback(self, interaction: discord.Interaction):
+        # Siden bygges fra job storens cache - ingen database eller board redigering
+        if self.liste == "medlem":
+            embed, view = build_member_jobs_page(job_store.member_jobs(), self.side)
+        else:
+            embed, view = build_permanent_jobs_page(job_store.permanent_jobs(), self.side)
         
-        # Opret knapper for denne sektion
-        section_view = await create_member_job_buttons_view(section_jobs)
-        if section_view.children:
-            section_label = f"Del {section_number}" if len(member_jobs) > JOBS_PER_SECTION else "opgaver"
-            await kanal.send(f"**Medlems {section_label}:**", view=section_view)
+        # Bladring i en ephemeral side redigerer den - fra det offentlige board åbnes en ny
+        if interaction.message is not None and interaction.message.flags.ephemeral:
+            respond = lambda: interaction.response.edit_message(embed=embed, view=view)
+        else:
+            respond = lambda: interaction.response.send_message(embed=embed, view=view or discord.utils.MISSING,
+                                                                ephemeral=True)
+        await outbound.submit("interaction", respond, PRIORITET_INTERAKTION)
+
+class PermanentJobButton(discord.ui.DynamicItem[Button], template=r"permanent_job_(?P<job_number>\d+)"):
+    """Nummerknap for en permanent opgave på job boardet"""
+    def __init__(self, job_number):
+        super().__init__(Button(
+            label=f"#{job_number}",
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"permanent_job_{job_number}"
+        ))
+        self.job_number = job_number
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match["job_number"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        await handle_permanent_job(interaction, self.job_number)
+
+class TakeJobButton(discord.ui.DynamicItem[Button], template=r"take_job_(?P<job_id>.+)"):
+    """Tag job knap for et medlems job på job boardet"""
+    def __init__(self, job_id, job_number="?"):
+        super().__init__(Button(
+            label=f"#{job_number}",
+            style=discord.ButtonStyle.success,
+            custom_id=f"take_job_{job_id}"
+        ))
+        self.job_id = job_id
 
-async def create_permanent_job_buttons_view(permanent_jobs):
-    """Opret view med knapper for permanente jobs"""
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["job_id"], item.label.lstrip("#"))
+
+    async def callback(self, interaction: discord.Interaction):
+        await handle_take_job(interaction, self.job_id)
+
+def create_permanent_job_buttons_view(job_numbers):
+    """Opret view med knapper for de givne permanente job numre"""
     view = View(timeout=None)
     
-    for i, job in enumerate(permanent_jobs, 1):
-        if len(view.children) >= 25:  # Discord limit
-            break
-        button = Button(
-            label=f"#{i}",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"permanent_job_{i}"
-        )
-        view.add_item(button)
+    for job_number in job_numbers:
+        view.add_item(PermanentJobButton(job_number))
     
     return view
 
-async def create_member_job_buttons_view(jobs):
-    """Opret view med knapper for member jobs"""
+def create_member_job_buttons_view(jobs):
+    """Opret view med knapper for de ledige member jobs"""
     view = View(timeout=None)
     
     for job in jobs:
-        if job["status"] == "ledig" and len(view.children) < 25:
-            job_number = job.get("job_number", "?")
-            button = Button(
-                label=f"#{job_number}",
-                style=discord.ButtonStyle.success,
-                custom_id=f"take_job_{job['id']}"
-            )
-            view.add_item(button)
+        if job["status"] == "ledig":
+            view.add_item(TakeJobButton(job["id"], job.get("job_number", "?")))
     
     return view
 
 async def update_prospect_supporter_embed(kanal):
-    """Opdater prospect_supporter embed - bevar main info besked"""
+    """Opdater prospect_supporter kanal - rediger kun de sektioner der har ændret sig"""
     try:
-        # Hent alle beskeder i kanalen
-        messages = []
-        async for message in kanal.history(limit=50):
-            if message.author == bot.user:
-                messages.append(message)
-        
-        # Bevar første besked (main info), slet resten
-        if len(messages) > 1:
-            # Slet alle beskeder undtagen den første (nyeste er først i listen)
-            for message in messages[:-1]:  # Alle undtagen den sidste (ældste/første)
-                try:
-                    await message.delete()
-                except:
-                    pass
-        
-        # Send opdaterede sektioner
-        permanent_jobs = get_permanent_jobs()
-        member_jobs = get_member_jobs()
-        
-        await send_permanent_jobs_section(kanal, permanent_jobs)
-        
-        if member_jobs:
-            await send_member_jobs_sections(kanal, member_jobs)
-        
-        # Opdater knapper i alle aktive private kanaler
-        await update_all_private_channel_buttons()
+        sections = build_board_sections()
+        try:
+            api_calls = await board_renderer.render(kanal, sections)
+        except discord.NotFound:
+            # En board besked er slettet udefra - rækkefølgen kan ikke genskabes, så ryd og send forfra
+            await message_index.cleanup(kanal)
+            await board_renderer.reset()
+            api_calls = await board_renderer.render(kanal, sections)
+        if api_calls:
+            print(f"🔄 Job board opdateret med {api_calls} API kald")
         
     except Exception as e:
+        # Forbigående fejl (5xx, 429 o.l.) - næste dirty markering prøver diff renderen igen
         print(f"Fejl ved opdatering af prospect_supporter embed: {e}")
-        # Fallback: purge og send helt nyt
-        try:
-            await kanal.purge()
-            await send_prospect_supporter_embed(kanal)
-        except Exception as e2:
-            print(f"Fallback fejl: {e2}")
 
-async def update_all_private_channel_buttons():
-    """Opdater knapper i alle aktive private kanaler"""
-    try:
-        active_channels = get_all_active_private_channels()
-        
-        for channel_id, job_id in active_channels:
-            if channel_id:
-                await update_private_channel_buttons(channel_id, job_id)
-                
-    except Exception as e:
-        print(f"Fejl ved opdatering af private kanal knapper: {e}")
+async def render_job_board():
+    """Refresh target for prospect_supporter kanalen"""
+    kanal = bot.get_channel(OPGAVE_KANAL_ID)
+    if kanal:
+        return await submit_cosmetic("board", lambda: update_prospect_supporter_embed(kanal))
+
+refresh_scheduler.register("board", render_job_board)
+
+def update_all_private_channel_buttons():
+    """Marker knapperne i alle aktive private kanaler til opdatering (bruges ved opstart)"""
+    for channel_id, job_id in job_store.active_private_channels():
+        mark_private_channel_dirty(channel_id, job_id)
+
+def mark_private_channel_dirty(channel_id, job_id):
+    """Marker en privat kanal til opdatering via refresh scheduleren"""
+    key = f"privat:{channel_id}"
+    refresh_scheduler.mark_dirty(
+        key,
+        lambda: submit_cosmetic(key, lambda: update_private_channel_buttons(channel_id, job_id))
+    )
+
+async def submit_cosmetic(key, factory):
+    """Send en refresh render gennem den udgående kø med lav prioritet.
+    Droppes hvis target er blevet markeret dirty igen mens den ventede - den nye render dækker den.
+    Returnerer False når den blev droppet, så refresh scheduleren ikke frigiver ventende flush kald."""
+    route = key.split(":")[0]
+    result = await outbound.submit(route, factory, PRIORITET_KOSMETISK,
+                                   stale=lambda: refresh_scheduler.is_pending(key))
+    return result is not DROPPED
+
+def on_member_job_changed(job):
+    """JobStore listener - opdater kun den private kanal for det job der faktisk ændrede sig"""
+    channel_id = job.get("privat_kanal_id")
+    if job["status"] != "optaget" or not channel_id or not job.get("kontrol_panel_id"):
+        return  # Kanal og panel er ikke på plads endnu
+    if bot.get_channel(channel_id) is None:
+        return  # Kanalen findes ikke længere
+    mark_private_channel_dirty(channel_id, job["id"])
+
+job_store.add_listener(on_member_job_changed)
 
 async def update_private_channel_buttons(channel_id, job_id):
-    """Opdater knapper i en specifik privat kanal"""
-    try:
-        channel = bot.get_channel(channel_id)
-        if not channel:
-            return
-        
-        # Find "Kontrol Panel" beskeden med knapper
-        control_panel_message = None
-        async for message in channel.history(limit=20):
-            if (message.author == bot.user and 
-                message.components and 
-                message.content and 
-                "Kontrol Panel" in message.content):
-                control_panel_message = message
-                break
-        
-        if control_panel_message:
-            # Hent opdateret job data
-            job = get_member_job_by_id(job_id)
-            if not job:
+    """Opdater knapper i en specifik privat kanal via det gemte kontrol panel besked ID"""
+    async with privat_kanal_semaphore:
+        try:
+            channel = bot.get_channel(channel_id)
+            job = job_store.get_member_job(job_id)
+            if not channel or not job:
                 return
             
             # Opret nye knapper med opdateret data
             new_control_view = JobControlView(job_id)
             
-            # Rediger kun knapperne, bevar beskeden
-            try:
-                await control_panel_message.edit(content="**🔄 Opdateret Kontrol Panel:**", view=new_control_view)
-                print(f"✅ Opdaterede knapper i kanal {channel_id}")
-            except Exception as edit_error:
-                print(f"Fejl ved redigering af kontrol panel: {edit_error}")
-                # Hvis redigering fejler, send ny besked
-                new_control_view = JobControlView(job_id)
-                await channel.send("**🔄 Nyt Kontrol Panel:**", view=new_control_view)
-        else:
-            # Hvis ingen kontrol panel findes, opret et nyt
-            job = get_member_job_by_id(job_id)
-            if job:
-                new_control_view = JobControlView(job_id)
-                await channel.send("**🔄 Kontrol Panel:**", view=new_control_view)
-                
-    except Exception as e:
-        print(f"Fejl ved opdatering af private kanal {channel_id}: {e}")
+            control_panel_id = job.get("kontrol_panel_id")
+            if control_panel_id:
+                # Rediger kun knapperne, bevar beskeden
+                try:
+                    await channel.get_partial_message(control_panel_id).edit(content="**🔄 Opdateret Kontrol Panel:**", view=new_control_view)
+                    print(f"✅ Opdaterede knapper i kanal {channel_id}")
+                    return
+                except discord.NotFound:
+                    print(f"⚠️ Kontrol panel i kanal {channel_id} findes ikke længere - sender nyt")
+            
+            # Hvis intet kontrol panel kendes, opret et nyt og gem dets ID
+            message = await channel.send("**🔄 Kontrol Panel:**", view=new_control_view)
+            await job_store.update_control_panel_id(job_id, message.id, notify=False)
+            
+        except Exception as e:
+            print(f"Fejl ved opdatering af private kanal {channel_id}: {e}")
+
 
+async def render_static_panel(kanal, renderer, sections):
+    """Render en kanal med faste paneler - sender kun noget hvis beskeden mangler eller er ændret"""
+    try:
+        try:
+            await renderer.render(kanal, sections)
+        except discord.NotFound:
+            # Beskeden er slettet udefra - send den igen
+            await renderer.reset()
+            await renderer.render(kanal, sections)
+    except Exception as e:
+        print(f"Fejl ved opdatering af panel i {kanal.name}: {e}")
 
-async def send_opgave_oprettelse_embed(kanal):
-    """Send medlem embed med knap til at oprette opgaver"""
+def build_opgave_oprettelse_section():
+    """Byg medlem embed med knap til at oprette opgaver"""
     embed = discord.Embed(
         title="📝 Opret Prospect/Supporter Opgave",
         description="**Har du brug for hjælp fra vores prospect_supporterne?**",
@@ -1332,8 +1272,7 @@ async def send_opgave_oprettelse_embed(kanal):
     
     embed.set_footer(text="Red Devils Prospect/Supporter System v1.0")
     
-    view = MedlemView()
-    await kanal.send(embed=embed, view=view)
+    return {"embed": embed, "view": MedlemView()}
 
 async def setup_prospect_supporter_stats_kanal():
     """Setup prospect_supporter statistik kanal"""
@@ -1342,40 +1281,43 @@ async def setup_prospect_supporter_stats_kanal():
         print(f"⚠️ Prospect/Supporter stats kanal med ID {STATUS_KANAL_ID} ikke fundet.")
         return
     
-    try:
-        # Clear channel
-        await kanal.purge()
-        print(f"🧹 Prospect/Supporter stats kanal {kanal.name} er ryddet.")
-    except Exception as e:
-        print(f"❌ Fejl under rydning af prospect_supporter stats kanal: {e}")
+    # Ryd kun kanalen hvis vi ikke allerede kender stats beskeden
+    if not await stats_renderer.load_state():
+        try:
+            # Clear channel
+            await kanal.purge()
+            print(f"🧹 Prospect/Supporter stats kanal {kanal.name} er ryddet.")
+        except Exception as e:
+            print(f"❌ Fejl under rydning af prospect_supporter stats kanal: {e}")
     
     # Send stats embed
-    await send_prospect_supporter_stats_embed(kanal)
+    await refresh_scheduler.flush("stats")
 
 async def setup_admin_panel_kanal():
-    """Setup admin panel kanal - sletter gamle beskeder og sender nyt kontrolpanel"""
+    """Setup admin panel kanal - genbruger kontrolpanelet hvis det allerede findes"""
     kanal = bot.get_channel(ADMIN_PANEL_KANAL_ID)
     if kanal is None:
         print(f"⚠️ Admin panel kanal med ID {ADMIN_PANEL_KANAL_ID} ikke fundet.")
         return
     
-    try:
-        # Slet kun bottens beskeder i kanalen
-        async for message in kanal.history(limit=50):
-            if message.author == bot.user:
-                try:
-                    await message.delete()
-                except:
-                    pass
-        print(f"🧹 Admin panel kanal {kanal.name} er ryddet for bot beskeder.")
-    except Exception as e:
-        print(f"❌ Fejl under rydning af admin panel kanal: {e}")
+    # Ryd kun op hvis vi ikke allerede kender kontrolpanelet
+    if not await admin_panel_renderer.load_state():
+        try:
+            # Slet kun bottens beskeder i kanalen - slås op i besked indekset
+            deleted, failed = await message_index.cleanup(kanal)
+            if not deleted and not failed:
+                # Intet registreret endnu (første opstart med indekset) - scan historikken én gang
+                bot_messages = [message.id async for message in kanal.history(limit=50) if message.author == bot.user]
+                deleted, failed = await message_index.delete(kanal, bot_messages)
+            print(f"🧹 Admin panel kanal {kanal.name} er ryddet for {deleted} bot beskeder ({failed} fejlede).")
+        except Exception as e:
+            print(f"❌ Fejl under rydning af admin panel kanal: {e}")
     
-    # Send admin panel embed
-    await send_admin_panel_embed(kanal)
+    # Send/opdater admin panel embed
+    await render_static_panel(kanal, admin_panel_renderer, [build_admin_panel_section()])
 
-async def send_admin_panel_embed(kanal):
-    """Send admin kontrolpanel embed"""
+def build_admin_panel_section():
+    """Byg admin kontrolpanel embed"""
     embed = discord.Embed(
         title="🔧 Red Devils Admin Kontrol Panel",
         description="**Kontrolpanel for administratorer**",
@@ -1400,9 +1342,7 @@ async def send_admin_panel_embed(kanal):
     embed.set_footer(text="Red Devils Admin System v1.0")
     embed.timestamp = datetime.now()
     
-    admin_view = AdminControlView()
-    await kanal.send(embed=embed, view=admin_view)
-    print(f"✅ Admin kontrolpanel sendt til {kanal.name}")
+    return {"embed": embed, "view": AdminControlView()}
 
 # Disabled: Markbetalinger
 # async def setup_markbetalinger_kanal():
@@ -1513,201 +1453,71 @@ async def send_admin_panel_embed(kanal):
 #         
 #         await kanal.send(embed=section_embed)
 
-def get_prospect_supporter_stats():
-    """Get prospect_supporter statistics from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT prospect_supporter_id, prospect_supporter_navn, total_points 
-            FROM prospect_supporter_stats 
-            ORDER BY total_points DESC
-        """)
-        stats = cursor.fetchall()
-        conn.close()
-        return stats
-    except Exception as e:
-        print(f"Fejl ved hentning af prospect_supporter stats: {e}")
-        return []
+async def load_leaderboards():
+    """Indlæs pointsummer én gang - derefter holdes ranglisterne opdateret i hukommelsen"""
+    # Fold events der ikke nåede at blive komprimeret før sidste nedlukning ind først
+    await point_ledger.compact()
+    point_ledger.start()
+    await ensure_all_prospect_supporters_in_stats()
+    leaderboards.load(await db.get_prospect_supporter_stats())
+    since = date.today() - timedelta(days=leaderboards.buckets.keep_days)
+    leaderboards.load_buckets(await db.get_point_buckets(since.isoformat()))
+
+job_store.add_points_listener(leaderboards.award)
 
-def get_current_supporter_stats(guild):
+async def get_current_supporter_stats(guild):
     """Get supporter stats kun for folk med supporter rollen lige nu"""
-    try:
-        supporter_role = discord.utils.get(guild.roles, id=SUPPORTER_ROLLE_ID)
-        if not supporter_role:
-            return []
-        
-        current_supporter_ids = [member.id for member in supporter_role.members]
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        if current_supporter_ids:
-            placeholders = ','.join(['?' for _ in current_supporter_ids])
-            cursor.execute(f"""
-            SELECT prospect_supporter_id, prospect_supporter_navn, total_points 
-            FROM prospect_supporter_stats 
-            WHERE prospect_supporter_id IN ({placeholders})
-            ORDER BY total_points DESC
-            """, current_supporter_ids)
-            stats = cursor.fetchall()
-        else:
-            stats = []
-        
-        conn.close()
-        return stats
-    except Exception as e:
-        print(f"Fejl ved hentning af supporter stats: {e}")
-        return []
+    return leaderboards.rows("supporter")
 
-def get_current_prospect_stats(guild):
+async def get_current_prospect_stats(guild):
     """Get prospect stats kun for folk med prospect rollen lige nu"""
-    try:
-        prospect_role = discord.utils.get(guild.roles, id=PROSPECT_ROLLE_ID)
-        if not prospect_role:
-            return []
-        
-        current_prospect_ids = [member.id for member in prospect_role.members]
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        if current_prospect_ids:
-            placeholders = ','.join(['?' for _ in current_prospect_ids])
-            cursor.execute(f"""
-            SELECT prospect_supporter_id, prospect_supporter_navn, total_points 
-            FROM prospect_supporter_stats 
-            WHERE prospect_supporter_id IN ({placeholders})
-            ORDER BY total_points DESC
-            """, current_prospect_ids)
-            stats = cursor.fetchall()
-        else:
-            stats = []
-        
-        conn.close()
-        return stats
-    except Exception as e:
-        print(f"Fejl ved hentning af prospect stats: {e}")
-        return []
+    return leaderboards.rows("prospect")
 
-def get_current_prospect_supporter_stats(guild):
+async def get_current_prospect_supporter_stats(guild):
     """Get prospect_supporter stats kun for folk med prospect_supporter rollen lige nu"""
-    try:
-        # Kombiner supporter og prospect stats
-        supporter_stats = get_current_supporter_stats(guild)
-        prospect_stats = get_current_prospect_stats(guild)
-        return supporter_stats + prospect_stats
-    except Exception as e:
-        print(f"Fejl ved hentning af aktuelle prospect_supporter stats: {e}")
-        return []
-
-def get_recent_completed_jobs(limit=5):
-    """Get recent completed jobs from database"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT titel, prospect_supporter_navn, completed_tid, job_number
-            FROM completed_jobs 
-            ORDER BY completed_tid DESC 
-            LIMIT ?
-        """, (limit,))
-        jobs = cursor.fetchall()
-        conn.close()
-        return jobs
-    except Exception as e:
-        print(f"Fejl ved hentning af seneste jobs: {e}")
-        return []
-
-def get_recent_completed_jobs_current_prospect_supporters(guild, limit=5):
+    # Kombiner supporter og prospect stats
+    supporter_stats = await get_current_supporter_stats(guild)
+    prospect_stats = await get_current_prospect_stats(guild)
+    return supporter_stats + prospect_stats
+
+def build_window_ranking_text(window, limit=5):
+    """Top supporters og prospects inden for et rullende vindue - læses fra de daglige point buckets"""
+    text = "```\n"
+    for name, label in (("supporter", "Supporters"), ("prospect", "Prospects")):
+        rows = leaderboards.window_rows(name, window, limit)
+        text += f"{label}:\n"
+        if not rows:
+            text += "    Ingen points endnu\n"
+        for i, (member_id, navn, points) in enumerate(rows, 1):
+            text += f"{i:2d}. {navn[:20].ljust(20)} {points:3d} points\n"
+    text += "```"
+    return text
+
+async def get_recent_completed_jobs_current_prospect_supporters(guild, limit=5):
     """Get recent completed jobs kun fra folk der stadig har prospect_supporter rollen"""
-    try:
-        prospect_supporter_role = discord.utils.get(guild.roles, id=PROSPECT_SUPPORTER_ROLLE_IDS[0])
-        if not prospect_supporter_role:
-            return []
-        
-        # Hent alle prospect_supporter IDs der har rollen lige nu
-        current_prospect_supporter_ids = [member.id for member in prospect_supporter_role.members]
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        if current_prospect_supporter_ids:
-            placeholders = ','.join(['?' for _ in current_prospect_supporter_ids])
-            cursor.execute(f"""
-                SELECT titel, prospect_supporter_navn, completed_tid, job_number
-                FROM completed_jobs 
-                WHERE prospect_supporter_id IN ({placeholders})
-                ORDER BY completed_tid DESC 
-                LIMIT ?
-            """, current_prospect_supporter_ids + [limit])
-            jobs = cursor.fetchall()
-        else:
-            jobs = []
-        
-        conn.close()
-        return jobs
-    except Exception as e:
-        print(f"Fejl ved hentning af seneste jobs fra aktuelle prospect_supporterne: {e}")
-        return []
+    # Hent alle prospect_supporter IDs der har rollen lige nu
+    current_prospect_supporter_ids = role_index.members(PROSPECT_SUPPORTER_ROLLE_IDS[0])
+    return await db.get_recent_completed_jobs(current_prospect_supporter_ids, limit)
 
-async def ensure_all_prospect_supporters_in_stats(guild):
-    """Sørg for at alle med prospect_supporter/supporter/prospect rollen er i statistik tabellen og fjern gamle"""
+async def ensure_all_prospect_supporters_in_stats(member_ids=None):
+    """Sørg for at members med supporter/prospect rollen er i statistik tabellen med deres nuværende navn.
+    Kaldes kun når medlemskab eller navne ændrer sig - member_ids=None synkroniserer alle."""
     try:
-        supporter_role = discord.utils.get(guild.roles, id=SUPPORTER_ROLLE_ID)
-        prospect_role = discord.utils.get(guild.roles, id=PROSPECT_ROLLE_ID)
-        
-        all_members = []
-        if supporter_role:
-            all_members.extend(supporter_role.members)
-        if prospect_role:
-            all_members.extend(prospect_role.members)
-        
-        # Fjern duplikater
-        all_members = list({member.id: member for member in all_members}.values())
-        
-        current_prospect_supporter_ids = [member.id for member in all_members]
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Indsæt alle aktuelle members i tabellen hvis de ikke allerede er der
-        for member in all_members:
-            cursor.execute("""
-                INSERT OR IGNORE INTO prospect_supporter_stats (prospect_supporter_id, prospect_supporter_navn, total_points)
-                VALUES (?, ?, 0)
-            """, (member.id, member.display_name))
-        
-        # Opdater navne for eksisterende members
-        for member in all_members:
-            cursor.execute("""
-                UPDATE prospect_supporter_stats 
-                SET prospect_supporter_navn = ?, last_updated = CURRENT_TIMESTAMP
-                WHERE prospect_supporter_id = ?
-            """, (member.display_name, member.id))
-        
-        # VIGTIGT: Marker folk uden rolle som inaktive
-        # Vi sletter ikke deres data, men de vises ikke i listen
-        if current_prospect_supporter_ids:
-            placeholders = ','.join(['?' for _ in current_prospect_supporter_ids])
-            cursor.execute(f"""
-                UPDATE prospect_supporter_stats 
-                SET last_updated = CURRENT_TIMESTAMP
-                WHERE prospect_supporter_id NOT IN ({placeholders})
-            """, current_prospect_supporter_ids)
-        
-        conn.commit()
-        conn.close()
-        print(f"✅ Real-time opdaterede stats for {len(all_members)} aktive members ({len(supporter_role.members) if supporter_role else 0} supporters, {len(prospect_role.members) if prospect_role else 0} prospects)")
+        all_member_ids = role_index.members(SUPPORTER_ROLLE_ID) | role_index.members(PROSPECT_ROLLE_ID)
+        if member_ids is not None:
+            all_member_ids &= set(member_ids)
+        if not all_member_ids:
+            return
+        
+        # Folk uden rolle slettes ikke, men de vises ikke i listen
+        await db.sync_prospect_supporter_members([(member_id, role_index.name(member_id)) for member_id in all_member_ids])
+        print(f"✅ Synkroniserede {len(all_member_ids)} members til statistik tabellen")
         
     except Exception as e:
-        print(f"Fejl ved real-time opdatering af prospect_supporter stats: {e}")
+        print(f"Fejl ved synkronisering af prospect_supporter stats: {e}")
 
-async def send_prospect_supporter_stats_embed(kanal):
-    """Send prospect_supporter statistik embed med separate lister for supporters og prospects"""
-    # Sørg for alle prospect_supporterne er i databasen
-    await ensure_all_prospect_supporters_in_stats(kanal.guild)
-    
+async def build_prospect_supporter_stats_embed(guild):
+    """Byg prospect_supporter statistik embed med separate lister for supporters og prospects"""
     embed = discord.Embed(
         title="📊 Prospect/Supporter Statistikker",
         description="**Oversigt over alle supporters og prospects og deres points**",
@@ -1716,7 +1526,7 @@ async def send_prospect_supporter_stats_embed(kanal):
     embed.set_thumbnail(url=LOGO_URL)
     
     # Get supporter stats
-    supporter_stats = get_current_supporter_stats(kanal.guild)
+    supporter_stats = await get_current_supporter_stats(guild)
     if supporter_stats:
         supporter_text = "```\n"
         for i, (supporter_id, supporter_navn, total_points) in enumerate(supporter_stats, 1):
@@ -1737,7 +1547,7 @@ async def send_prospect_supporter_stats_embed(kanal):
         )
     
     # Get prospect stats
-    prospect_stats = get_current_prospect_stats(kanal.guild)
+    prospect_stats = await get_current_prospect_stats(guild)
     if prospect_stats:
         prospect_text = "```\n"
         for i, (prospect_id, prospect_navn, total_points) in enumerate(prospect_stats, 1):
@@ -1757,8 +1567,20 @@ async def send_prospect_supporter_stats_embed(kanal):
             inline=False
         )
     
+    # Rullende ranglister fra de daglige point buckets
+    embed.add_field(
+        name="📅 Denne Uge",
+        value=build_window_ranking_text("uge"),
+        inline=False
+    )
+    embed.add_field(
+        name="🗓️ Denne Måned",
+        value=build_window_ranking_text("måned"),
+        inline=False
+    )
+    
     # Recent completed jobs med mørkeblå felt stil (kun fra aktuelle prospect_supporterne)
-    recent_jobs = get_recent_completed_jobs_current_prospect_supporters(kanal.guild, 5)
+    recent_jobs = await get_recent_completed_jobs_current_prospect_supporters(guild, 5)
     if recent_jobs:
         recent_text = "```\n"
         for titel, prospect_supporter_navn, completed_tid, job_number in recent_jobs:
@@ -1782,19 +1604,29 @@ async def send_prospect_supporter_stats_embed(kanal):
     
     embed.set_footer(text="Red Devils Prospect/Supporter Stats v1.0")
     embed.timestamp = datetime.now()
-    
-    # Send kun én embed (som på billedet)
-    await kanal.send(embed=embed)
+    return embed
 
 class JobControlView(View):
+    """Kontrol panel i en privat job kanal - knapperne er dynamiske og virker efter genstart"""
     def __init__(self, job_id):
         super().__init__(timeout=None)
         self.job_id = job_id
+        self.add_item(CancelJobButton(job_id))
+        self.add_item(CompleteJobButton(job_id))
+        self.add_item(ForceCloseJobButton(job_id))
+
+class CancelJobButton(discord.ui.DynamicItem[Button], template=r"job_cancel:(?P<job_id>.+)"):
+    def __init__(self, job_id):
+        super().__init__(Button(label="❌ Cancel Job", style=discord.ButtonStyle.danger, custom_id=f"job_cancel:{job_id}"))
+        self.job_id = job_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["job_id"])
 
-    @discord.ui.button(label="❌ Cancel Job", style=discord.ButtonStyle.danger)
-    async def cancel_job(self, interaction: discord.Interaction, button: Button):
+    async def callback(self, interaction: discord.Interaction):
         # Find jobbet
-        job = get_member_job_by_id(self.job_id)
+        job = job_store.get_member_job(self.job_id)
         
         if not job:
             await interaction.response.send_message("⛔ Dette job eksisterer ikke længere!", ephemeral=True)
@@ -1806,13 +1638,11 @@ class JobControlView(View):
             return
         
         # Cancel jobbet
-        if update_member_job_status(self.job_id, "ledig"):
+        if await job_store.update_member_job_status(self.job_id, "ledig"):
             await interaction.response.send_message("✅ Jobbet er blevet cancelled og er nu ledigt igen!", ephemeral=False)
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
             
             # Slet den private kanal efter 10 sekunder
             await asyncio.sleep(10)
@@ -1823,10 +1653,18 @@ class JobControlView(View):
         else:
             await interaction.response.send_message("⛔ Fejl ved cancellation af job!", ephemeral=True)
 
-    @discord.ui.button(label="✅ Job Færdigt", style=discord.ButtonStyle.success)
-    async def complete_job(self, interaction: discord.Interaction, button: Button):
+class CompleteJobButton(discord.ui.DynamicItem[Button], template=r"job_complete:(?P<job_id>.+)"):
+    def __init__(self, job_id):
+        super().__init__(Button(label="✅ Job Færdigt", style=discord.ButtonStyle.success, custom_id=f"job_complete:{job_id}"))
+        self.job_id = job_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["job_id"])
+
+    async def callback(self, interaction: discord.Interaction):
         # Find jobbet
-        job = get_member_job_by_id(self.job_id)
+        job = job_store.get_member_job(self.job_id)
         
         if not job:
             await interaction.response.send_message("⛔ Dette job eksisterer ikke længere!", ephemeral=True)
@@ -1840,8 +1678,16 @@ class JobControlView(View):
         # Vis modal til at indtaste point reward
         await interaction.response.send_modal(CompleteJobModal(self.job_id, interaction.channel))
 
-    @discord.ui.button(label="🔨 FORCE LUK", style=discord.ButtonStyle.secondary, emoji="⚠️")
-    async def force_close(self, interaction: discord.Interaction, button: Button):
+class ForceCloseJobButton(discord.ui.DynamicItem[Button], template=r"job_force_close:(?P<job_id>.+)"):
+    def __init__(self, job_id):
+        super().__init__(Button(label="🔨 FORCE LUK", style=discord.ButtonStyle.secondary, emoji="⚠️", custom_id=f"job_force_close:{job_id}"))
+        self.job_id = job_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["job_id"])
+
+    async def callback(self, interaction: discord.Interaction):
         # Tjek om brugeren er super admin eller dev (DEV rolle bypasser)
         if not tjek_dev_rolle(interaction.user) and interaction.user.id != ABSOLUT_ADMIN_ID:
             await interaction.response.send_message("⛔ Kun super admin kan force-lukke tickets!", ephemeral=True)
@@ -1850,14 +1696,12 @@ class JobControlView(View):
         await interaction.response.send_message("⚠️ **FORCE LUK** - Kanalen lukkes om 5 sekunder af super admin...", ephemeral=False)
         
         # Marker job som cancelled hvis det stadig eksisterer
-        job = get_member_job_by_id(self.job_id)
+        job = job_store.get_member_job(self.job_id)
         if job and job["status"] != "faerdig":
-            update_member_job_status(self.job_id, "ledig")
+            await job_store.update_member_job_status(self.job_id, "ledig")
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
         
         # Slet kanalen efter 5 sekunder
         await asyncio.sleep(5)
@@ -1867,36 +1711,37 @@ class JobControlView(View):
             pass
 
 async def update_prospect_supporter_stats_embed(kanal):
-    """Opdater prospect_supporter stats embed"""
+    """Opdater prospect_supporter stats embed på stedet - intet API kald hvis indholdet er uændret"""
     try:
-        await kanal.purge()
-        await send_prospect_supporter_stats_embed(kanal)
+        # Kun én embed (som på billedet)
+        sections = [{"embed": await build_prospect_supporter_stats_embed(kanal.guild)}]
+        try:
+            await stats_renderer.render(kanal, sections)
+        except discord.NotFound:
+            # Stats beskeden er slettet udefra - start forfra
+            await message_index.cleanup(kanal)
+            await stats_renderer.reset()
+            await stats_renderer.render(kanal, sections)
     except Exception as e:
         print(f"Fejl ved opdatering af prospect_supporter stats embed: {e}")
 
-@bot.event
-async def on_interaction(interaction):
-    """Handle button interactions"""
-    if interaction.type == discord.InteractionType.component:
-        custom_id = interaction.data.get("custom_id", "")
-        
-        if custom_id.startswith("take_job_"):
-            await handle_take_job(interaction, custom_id)
-        elif custom_id.startswith("permanent_job_"):
-            await handle_permanent_job(interaction, custom_id)
+async def render_stats():
+    """Refresh target for stats kanalen"""
+    kanal = bot.get_channel(STATUS_KANAL_ID)
+    if kanal:
+        return await submit_cosmetic("stats", lambda: update_prospect_supporter_stats_embed(kanal))
 
-async def handle_permanent_job(interaction, custom_id):
+refresh_scheduler.register("stats", render_stats)
+
+async def handle_permanent_job(interaction, job_number):
     """Handle når en prospect_supporter tager en permanent opgave"""
-    job_number = int(custom_id.replace("permanent_job_", ""))
-    
-    # Hent permanent jobs
-    permanent_jobs = get_permanent_jobs()
+    # Hent permanent job
+    job_title = job_store.permanent_job(job_number)
     
-    if job_number < 1 or job_number > len(permanent_jobs):
+    if job_title is None:
         await interaction.response.send_message("⛔ Ugyldig opgave nummer!", ephemeral=True)
         return
     
-    job_title = permanent_jobs[job_number - 1]
     prospect_supporter = interaction.user
     
     # Tjek om brugeren har admin rolle for at finde admin
@@ -1908,34 +1753,30 @@ async def handle_permanent_job(interaction, custom_id):
         await interaction.response.send_message("⛔ Admins kan ikke tage permanente opgaver!", ephemeral=True)
         return
     
-    admin_user = None
-    
-    # Find en admin til at koordinere med
+    # Find den mindst belastede tilgængelige admin til at koordinere med
     guild = interaction.guild
-    admin_members = []
+    admin_id = admin_roster.pick(lambda admin_id: admin_id != prospect_supporter.id and admin_available(guild, admin_id))
     
-    # Saml alle medlemmer med admin roller
-    for admin_role_id in ADMIN_ROLLE_IDS:
-        admin_role = discord.utils.get(guild.roles, id=admin_role_id)
-        if admin_role and admin_role.members:
-            admin_members.extend(admin_role.members)
-    
-    # Fjern duplikater
-    admin_members = list(set(admin_members))
-    
-    if not admin_members:
+    if admin_id is None:
         await interaction.response.send_message("⛔ Ingen admins tilgængelige!", ephemeral=True)
         return
     
-    # Tag første tilgængelige admin
-    admin_user = admin_members[0]
+    admin_user = guild.get_member(admin_id)
+    
+    # Kvitter før kanalen oprettes - kanal arbejdet kan vente bag renders i den udgående kø
+    try:
+        await outbound.submit("interaction", lambda: interaction.response.defer(ephemeral=True, thinking=True),
+                              PRIORITET_INTERAKTION)
+    except Exception as e:
+        print(f"Fejl ved kvittering for permanent opgave #{job_number}: {e}")
+        return
     
     # Opret privat kanal
     try:
         kategori = discord.utils.get(guild.categories, id=PRIVAT_KATEGORI_ID)
         
         if not kategori:
-            await interaction.response.send_message("⛔ Kunne ikke finde kategorien til private kanaler!", ephemeral=True)
+            await interaction.followup.send("⛔ Kunne ikke finde kategorien til private kanaler!", ephemeral=True)
             return
         
         # Opret kanal navn
@@ -1948,10 +1789,8 @@ async def handle_permanent_job(interaction, custom_id):
             prospect_supporter: discord.PermissionOverwrite(read_messages=True, send_messages=True)
         }
         
-        privat_kanal = await kategori.create_text_channel(
-            name=kanal_navn,
-            overwrites=overwrites
-        )
+        privat_kanal = await outbound.submit("create_channel", lambda: channel_pool.acquire(kanal_navn, overwrites),
+                                             PRIORITET_KANAL)
         
         # Send besked i den private kanal
         perm_embed = discord.Embed(
@@ -1985,31 +1824,59 @@ async def handle_permanent_job(interaction, custom_id):
         
         await privat_kanal.send(f"{admin_user.mention} {prospect_supporter.mention}", embed=perm_embed, view=perm_view)
         
-        await interaction.response.send_message(f"✅ Permanent opgave taget! Privat kanal oprettet: {privat_kanal.mention}", ephemeral=True)
+        # Tæl sessionen med i adminens belastning indtil kanalen slettes
+        admin_roster.start_session(privat_kanal.id, admin_id)
+        await db.add_permanent_session(privat_kanal.id, admin_id, prospect_supporter.id, job_number)
+        
+        await outbound.submit("interaction", lambda: interaction.followup.send(
+            f"✅ Permanent opgave taget! Privat kanal oprettet: {privat_kanal.mention}", ephemeral=True
+        ), PRIORITET_INTERAKTION)
         
     except Exception as e:
         print(f"Fejl ved oprettelse af permanent opgave kanal: {e}")
-        await interaction.response.send_message("⛔ Fejl ved oprettelse af privat kanal!", ephemeral=True)
+        try:
+            await interaction.followup.send("⛔ Fejl ved oprettelse af privat kanal!", ephemeral=True)
+        except Exception:
+            pass
 
 class PermanentJobView(View):
+    """Knapper i en permanent opgave kanal - dynamiske så de virker efter genstart"""
     def __init__(self, job_number, job_title, prospect_supporter_id=None):
         super().__init__(timeout=None)
         self.job_number = job_number
         self.job_title = job_title
         self.prospect_supporter_id = prospect_supporter_id
+        self.add_item(CompletePermanentJobButton(prospect_supporter_id or 0))
+        self.add_item(ClosePermanentJobButton())
+        self.add_item(ForceClosePermanentJobButton())
+
+class CompletePermanentJobButton(discord.ui.DynamicItem[Button], template=r"perm_complete:(?P<prospect_supporter_id>\d+)"):
+    def __init__(self, prospect_supporter_id):
+        super().__init__(Button(label="✅ Afslut & Giv Point", style=discord.ButtonStyle.success, custom_id=f"perm_complete:{prospect_supporter_id}"))
+        self.prospect_supporter_id = prospect_supporter_id
 
-    @discord.ui.button(label="✅ Afslut & Giv Point", style=discord.ButtonStyle.success)
-    async def complete_with_points(self, interaction: discord.Interaction, button: Button):
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match["prospect_supporter_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
         # Tjek om brugeren er admin (DEV rolle bypasser)
         if not tjek_dev_rolle(interaction.user) and not tjek_admin_rolle(interaction.user):
             await interaction.response.send_message("⛔ Kun admins kan afslutte permanente opgaver med point!", ephemeral=True)
             return
         
         # Vis modal til at indtaste point reward
-        await interaction.response.send_modal(CompletePermanentJobModal(self.prospect_supporter_id, interaction.channel))
+        await interaction.response.send_modal(CompletePermanentJobModal(self.prospect_supporter_id or None, interaction.channel))
+
+class ClosePermanentJobButton(discord.ui.DynamicItem[Button], template=r"perm_close"):
+    def __init__(self):
+        super().__init__(Button(label="🔒 Luk Kanal", style=discord.ButtonStyle.danger, custom_id="perm_close"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls()
 
-    @discord.ui.button(label="🔒 Luk Kanal", style=discord.ButtonStyle.danger)
-    async def close_channel(self, interaction: discord.Interaction, button: Button):
+    async def callback(self, interaction: discord.Interaction):
         # Tjek om brugeren er admin eller prospect_supporter i kanalen (DEV rolle bypasser)
         if not tjek_dev_rolle(interaction.user) and not (tjek_admin_rolle(interaction.user) or 
                 interaction.channel.permissions_for(interaction.user).send_messages):
@@ -2025,8 +1892,15 @@ class PermanentJobView(View):
         except:
             pass
 
-    @discord.ui.button(label="🔨 FORCE LUK", style=discord.ButtonStyle.secondary, emoji="⚠️")
-    async def force_close(self, interaction: discord.Interaction, button: Button):
+class ForceClosePermanentJobButton(discord.ui.DynamicItem[Button], template=r"perm_force_close"):
+    def __init__(self):
+        super().__init__(Button(label="🔨 FORCE LUK", style=discord.ButtonStyle.secondary, emoji="⚠️", custom_id="perm_force_close"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls()
+
+    async def callback(self, interaction: discord.Interaction):
         # Tjek om brugeren er super admin eller dev (DEV rolle bypasser)
         if not tjek_dev_rolle(interaction.user) and interaction.user.id != ABSOLUT_ADMIN_ID:
             await interaction.response.send_message("⛔ Kun super admin kan force-lukke tickets!", ephemeral=True)
@@ -2072,25 +1946,13 @@ class CompletePermanentJobModal(Modal):
         
         # Giv point til prospect_supporter hvis der er nogen
         if point_reward > 0 and self.prospect_supporter_id:
-            try:
-                conn = sqlite3.connect(DB_PATH)
-                cursor = conn.cursor()
-                
-                # Hent prospect_supporter navn fra guild
-                guild = interaction.guild
-                member = guild.get_member(self.prospect_supporter_id)
-                prospect_supporter_navn = member.display_name if member else "Ukendt"
-                
-                # Update prospect_supporter stats with points
-                cursor.execute("""
-                    INSERT OR REPLACE INTO prospect_supporter_stats (prospect_supporter_id, prospect_supporter_navn, total_points)
-                    VALUES (?, ?, COALESCE((SELECT total_points FROM prospect_supporter_stats WHERE prospect_supporter_id = ?), 0) + ?)
-                """, (self.prospect_supporter_id, prospect_supporter_navn, self.prospect_supporter_id, point_reward))
-                
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                print(f"Fejl ved tildeling af point: {e}")
+            # Hent prospect_supporter navn fra guild
+            guild = interaction.guild
+            prospect_supporter_navn = await member_resolver.display_name(self.prospect_supporter_id, guild)
+            
+            # Update prospect_supporter stats with points
+            await job_store.award_points(self.prospect_supporter_id, prospect_supporter_navn, point_reward,
+                                         tildelt_af=interaction.user.id)
         
         if point_reward > 0:
             await interaction.response.send_message(f"🎉 Permanent opgave afsluttet! **{point_reward} point** tildelt. Kanalen lukkes om 10 sekunder...", ephemeral=False)
@@ -2098,9 +1960,7 @@ class CompletePermanentJobModal(Modal):
             await interaction.response.send_message("🎉 Permanent opgave afsluttet! Kanalen lukkes om 10 sekunder...", ephemeral=False)
         
         # Opdater stats kanal
-        stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-        if stats_kanal:
-            await update_prospect_supporter_stats_embed(stats_kanal)
+        refresh_scheduler.mark_dirty("stats")
         
         # Slet den private kanal efter 10 sekunder
         await asyncio.sleep(10)
@@ -2109,38 +1969,63 @@ class CompletePermanentJobModal(Modal):
         except:
             pass
 
-async def handle_take_job(interaction, custom_id):
-    """Handle når en prospect_supporter tager et job"""
-    job_id = custom_id.replace("take_job_", "")
-    
+async def handle_take_job(interaction, job_id):
+    """Handle når en prospect_supporter tager et job - kvitterer straks og opretter kanalen i baggrunden"""
     # Find jobbet
-    job = get_member_job_by_id(job_id)
+    job = job_store.get_member_job(job_id)
     
     if not job:
         await interaction.response.send_message("⛔ Dette job eksisterer ikke længere!", ephemeral=True)
         return
     
-    if job["status"] == "optaget":
+    # Tag jobbet atomisk - kun én kan vinde, taberne afvises uden yderligere Discord kald
+    if not await job_store.claim_member_job(job_id, interaction.user.id, interaction.user.display_name):
         await interaction.response.send_message("⛔ Dette job er allerede taget!", ephemeral=True)
         return
     
-    # Marker job som optaget
-    if not update_member_job_status(job_id, "optaget", interaction.user.id, interaction.user.display_name):
-        await interaction.response.send_message("⛔ Fejl ved tildeling af job!", ephemeral=True)
+    # Kvitter med det samme så vi aldrig rammer Discords 3 sekunders grænse
+    try:
+        await outbound.submit("interaction", lambda: interaction.response.defer(ephemeral=True, thinking=True),
+                              PRIORITET_INTERAKTION)
+    except Exception as e:
+        # Interaktionen er udløbet eller afvist - giv jobbet fri igen i stedet for at efterlade det optaget
+        print(f"Fejl ved kvittering for job {job_id} - jobbet er ledigt igen: {e}")
+        await rollback_job_claim(job_id)
         return
     
-    # Opret privat kanal
+    # Opdater prospect_supporter kanal
+    refresh_scheduler.mark_dirty("board")
+    
+    task = asyncio.create_task(provision_job_channel(interaction, job))
+    baggrunds_opgaver.add(task)
+    task.add_done_callback(baggrunds_opgaver.discard)
+
+async def provision_job_channel(interaction, job):
+    """Baggrunds pipeline: opret privat kanal, send beskeder og gem IDs - ruller jobbet tilbage ved fejl"""
+    job_id = job["id"]
+    prospect_supporter = interaction.user
+    timings = []
+    privat_kanal = None
+    stage_start = time.perf_counter()
+    
+    def stage_done(name):
+        nonlocal stage_start
+        now = time.perf_counter()
+        timings.append(f"{name} {(now - stage_start) * 1000:.0f}ms")
+        stage_start = now
+    
     try:
         guild = interaction.guild
         kategori = discord.utils.get(guild.categories, id=PRIVAT_KATEGORI_ID)
         
         if not kategori:
-            await interaction.response.send_message("⛔ Kunne ikke finde kategorien til private kanaler!", ephemeral=True)
-            return
+            raise RuntimeError("Kunne ikke finde kategorien til private kanaler")
         
-        # Hent medlem og prospect_supporter
-        medlem = await bot.fetch_user(job["oprettet_af"])
-        prospect_supporter = interaction.user
+        # Hent medlem - guild cache, så LRU cache, og først derefter API
+        medlem = await member_resolver.resolve(job["oprettet_af"], guild)
+        if medlem is None:
+            raise RuntimeError(f"Medlemmet {job['oprettet_af']} der oprettede jobbet findes ikke længere")
+        stage_done("medlem")
         
         # Opret kanal navn
         kanal_navn = f"job-{job['id']}-{medlem.display_name[:10]}"
@@ -2152,10 +2037,9 @@ async def handle_take_job(interaction, custom_id):
             prospect_supporter: discord.PermissionOverwrite(read_messages=True, send_messages=True)
         }
         
-        privat_kanal = await kategori.create_text_channel(
-            name=kanal_navn,
-            overwrites=overwrites
-        )
+        privat_kanal = await outbound.submit("create_channel", lambda: channel_pool.acquire(kanal_navn, overwrites),
+                                             PRIORITET_KANAL)
+        stage_done("kanal")
         
         # Send besked i den private kanal
         job_embed = discord.Embed(
@@ -2189,21 +2073,42 @@ async def handle_take_job(interaction, custom_id):
         
         # Send separat besked med knapper (denne kan opdateres senere)
         control_view = JobControlView(job_id)
-        await privat_kanal.send("**Kontrol Panel:**", view=control_view)
-        
-        # Gem kanal ID til jobbet
-        update_private_channel_id(job_id, privat_kanal.id)
+        control_message = await privat_kanal.send("**Kontrol Panel:**", view=control_view)
+        stage_done("beskeder")
         
-        await interaction.response.send_message(f"✅ Du har taget jobbet! Privat kanal oprettet: {privat_kanal.mention}", ephemeral=True)
-        
-        # Opdater prospect_supporter kanal
-        prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-        if prospect_supporter_kanal:
-            await update_prospect_supporter_embed(prospect_supporter_kanal)
+        # Gem kanal ID og kontrol panel ID til jobbet
+        await job_store.update_private_channel_id(job_id, privat_kanal.id)
+        await job_store.update_control_panel_id(job_id, control_message.id)
+        stage_done("gem")
             
     except Exception as e:
-        print(f"Fejl ved oprettelse af privat kanal: {e}")
-        await interaction.response.send_message("⛔ Fejl ved oprettelse af privat kanal!", ephemeral=True)
+        print(f"Fejl ved oprettelse af privat kanal for job {job_id} ({', '.join(timings) or 'ingen trin færdige'}): {e}")
+        await rollback_job_claim(job_id, privat_kanal)
+        try:
+            await interaction.followup.send("⛔ Fejl ved oprettelse af privat kanal - jobbet er ledigt igen!", ephemeral=True)
+        except Exception:
+            pass
+        return
+    
+    # Kanalen er klar og gemt - en fejlet bekræftelse må ikke rulle jobbet tilbage
+    try:
+        await outbound.submit("interaction", lambda: interaction.followup.send(
+            f"✅ Du har taget jobbet! Privat kanal oprettet: {privat_kanal.mention}", ephemeral=True
+        ), PRIORITET_INTERAKTION)
+        stage_done("svar")
+    except Exception as e:
+        print(f"⚠️ Kunne ikke bekræfte job {job_id} til {prospect_supporter.display_name}: {e}")
+    print(f"⏱️ Job {job_id} klar: {', '.join(timings)}")
+
+async def rollback_job_claim(job_id, privat_kanal=None):
+    """Fjern en halvt oprettet kanal og gør jobbet ledigt igen"""
+    if privat_kanal is not None:
+        try:
+            await privat_kanal.delete()
+        except Exception as e:
+            print(f"⚠️ Kunne ikke slette halvt oprettet kanal {privat_kanal.id}: {e}")
+    if await job_store.update_member_job_status(job_id, "ledig"):
+        refresh_scheduler.mark_dirty("board")
 
 class AddPermOpgaveModal(Modal):
     def __init__(self):
@@ -2221,13 +2126,11 @@ class AddPermOpgaveModal(Modal):
     async def on_submit(self, interaction: discord.Interaction):
         ny_opgave = self.opgave_tekst.value
         
-        if add_permanent_job(ny_opgave):
+        if await job_store.add_permanent_job(ny_opgave):
             await interaction.response.send_message(f"✅ Permanent opgave tilføjet: {ny_opgave}", ephemeral=True)
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
         else:
             await interaction.response.send_message("⛔ Denne opgave eksisterer allerede eller fejl ved tilføjelse!", ephemeral=True)
 
@@ -2248,20 +2151,17 @@ class EditPermOpgaveModal(Modal):
     async def on_submit(self, interaction: discord.Interaction):
         ny_tekst = self.opgave_tekst.value
         
-        if update_permanent_job(self.gammel_opgave, ny_tekst):
+        if await job_store.update_permanent_job(self.gammel_opgave, ny_tekst):
             await interaction.response.send_message(f"✅ Opgave opdateret:\n**Fra:** {self.gammel_opgave}\n**Til:** {ny_tekst}", ephemeral=True)
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
         else:
             await interaction.response.send_message("⛔ Fejl ved opdatering af opgave!", ephemeral=True)
 
 class RemovePermOpgaveSelect(Select):
-    def __init__(self):
+    def __init__(self, permanent_jobs):
         options = []
-        permanent_jobs = get_permanent_jobs()
         for opgave in permanent_jobs:
             # Begræns længden af opgave teksten til select menu
             display_text = opgave[:50] + "..." if len(opgave) > 50 else opgave
@@ -2276,20 +2176,17 @@ class RemovePermOpgaveSelect(Select):
     async def callback(self, interaction: discord.Interaction):
         opgave_to_remove = self.values[0]
         
-        if remove_permanent_job(opgave_to_remove):
+        if await job_store.remove_permanent_job(opgave_to_remove):
             await interaction.response.send_message(f"✅ Permanent opgave fjernet: {opgave_to_remove}", ephemeral=True)
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
         else:
             await interaction.response.send_message("⛔ Fejl ved fjernelse af opgave!", ephemeral=True)
 
 class EditPermOpgaveSelect(Select):
-    def __init__(self):
+    def __init__(self, permanent_jobs):
         options = []
-        permanent_jobs = get_permanent_jobs()
         for opgave in permanent_jobs:
             # Begræns længden af opgave teksten til select menu
             display_text = opgave[:50] + "..." if len(opgave) > 50 else opgave
@@ -2402,13 +2299,13 @@ async def prospect_supporterbot_admin_old(ctx, action=None, subaction=None, *arg
             return
         
         # Find jobbet
-        job = get_member_job_by_number(job_number)
+        job = job_store.get_member_job_by_number(job_number)
         if not job:
             await ctx.send(f"⛔ Ingen opgave fundet med nummer **{job_number}**!")
             return
         
         # Slet jobbet
-        success, privat_kanal_id = delete_member_job_by_id(job["id"])
+        success, privat_kanal_id = await job_store.delete_member_job_by_id(job["id"])
         
         if success:
             # Luk privat kanal hvis den eksisterer (uden at sende besked)
@@ -2422,9 +2319,7 @@ async def prospect_supporterbot_admin_old(ctx, action=None, subaction=None, *arg
                         pass
             
             # Opdater prospect_supporter kanal
-            prospect_supporter_kanal = bot.get_channel(OPGAVE_KANAL_ID)
-            if prospect_supporter_kanal:
-                await update_prospect_supporter_embed(prospect_supporter_kanal)
+            refresh_scheduler.mark_dirty("board")
             
             embed = discord.Embed(
                 title="✅ Opgave Slettet",
@@ -2473,23 +2368,23 @@ async def prospect_supporterbot_admin_old(ctx, action=None, subaction=None, *arg
         await ctx.send("Tryk på knappen for at tilføje en ny permanent opgave:", view=view)
     
     elif subaction.lower() == "edit":
-        permanent_jobs = get_permanent_jobs()
+        permanent_jobs = job_store.permanent_jobs()
         if not permanent_jobs:
             await ctx.send("⛔ Ingen permanente opgaver at redigere!")
             return
         
         view = View()
-        view.add_item(EditPermOpgaveSelect())
+        view.add_item(EditPermOpgaveSelect(permanent_jobs))
         await ctx.send("Vælg opgave at redigere:", view=view)
     
     elif subaction.lower() == "remove":
-        permanent_jobs = get_permanent_jobs()
+        permanent_jobs = job_store.permanent_jobs()
         if not permanent_jobs:
             await ctx.send("⛔ Ingen permanente opgaver at fjerne!")
             return
         
         view = View()
-        view.add_item(RemovePermOpgaveSelect())
+        view.add_item(RemovePermOpgaveSelect(permanent_jobs))
         await ctx.send("Vælg opgave at fjerne:", view=view)
     
     else:
@@ -2503,16 +2398,90 @@ async def refresh_stats(ctx):
         return
     
     try:
-        stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-        if stats_kanal:
-            await update_prospect_supporter_stats_embed(stats_kanal)
-            await ctx.send("✅ Prospect/Supporter statistikker er blevet opdateret!")
-        else:
-            await ctx.send("⛔ Stats kanal ikke fundet!")
+        await refresh_scheduler.flush("stats")
+        await ctx.send("✅ Prospect/Supporter statistikker er blevet opdateret!")
     except Exception as e:
         await ctx.send(f"⛔ Fejl ved opdatering: {e}")
         print(f"Fejl ved manual stats refresh: {e}")
 
+@bot.command()
+async def fravaer(ctx):
+    """Meld fravær fra (eller tilbage til) fordelingen af permanente opgaver (admin kun)"""
+    if not tjek_admin_rolle(ctx.author):
+        await ctx.send("⛔ Kun admins kan melde fravær!")
+        return
+    
+    fravaer_ids = set(json.loads(await db.get_setting("admin_fravaer", "[]")))
+    if ctx.author.id in fravaer_ids:
+        fravaer_ids.discard(ctx.author.id)
+        besked = "✅ Du får igen tildelt permanente opgaver."
+    else:
+        fravaer_ids.add(ctx.author.id)
+        besked = "✅ Du er meldt fraværende og får ikke tildelt permanente opgaver."
+    
+    await db.set_setting("admin_fravaer", json.dumps(sorted(fravaer_ids)))
+    admin_roster.set_opted_out(fravaer_ids)
+    await ctx.send(besked)
+
+@bot.command()
+async def arkiv(ctx, *, soegning: str = None):
+    """Søg i færdige jobs, også dem der er flyttet til arkivet (admin kun)"""
+    if not tjek_admin_rolle(ctx.author):
+        await ctx.send("⛔ Du har ikke tilladelse til at søge i arkivet!")
+        return
+    
+    if not soegning:
+        await ctx.send("Brug: `!arkiv <titel, navn eller #jobnummer>`")
+        return
+    
+    limit = 15
+    try:
+        jobs = await db.search_completed_jobs(soegning, limit)
+        if len(jobs) < limit:
+            jobs += await job_archive.search(soegning, limit - len(jobs), exclude=[job_key(job) for job in jobs])
+    except Exception as e:
+        await ctx.send(f"⛔ Fejl ved søgning: {e}")
+        print(f"Fejl ved arkiv søgning: {e}")
+        return
+    
+    if not jobs:
+        await ctx.send(f"Ingen færdige jobs matcher `{soegning}`.")
+        return
+    
+    result_text = "```\n"
+    for job in jobs:
+        date_str = (job["completed_tid"] or "?")[:10]
+        titel = job["titel"][:25] + "..." if len(job["titel"]) > 25 else job["titel"]
+        result_text += f"#{job['job_number'] or 0:3d} {titel.ljust(28)} {(job['prospect_supporter_navn'] or '')[:15]}\n"
+        result_text += f"     {date_str} - {job['point_reward'] or 0} points\n"
+    result_text += "```"
+    await ctx.send(f"🔎 {len(jobs)} færdige jobs matcher `{soegning}`:\n{result_text}")
+
+@bot.command()
+async def point_tjek(ctx):
+    """Genafspil point ledgeren og sammenlign med stats tabellen (admin kun)"""
+    if not tjek_admin_rolle(ctx.author):
+        await ctx.send("⛔ Du har ikke tilladelse til at tjekke point!")
+        return
+    
+    # Fold alt ind først, så snapshot og ledger skal stemme præcist
+    await point_ledger.compact()
+    replayed = await db.replay_point_totals()
+    snapshot = {member_id: points for member_id, _, points in await db.get_prospect_supporter_stats()}
+    
+    afvigelser = [(member_id, snapshot.get(member_id, 0), replayed.get(member_id, 0))
+                  for member_id in set(replayed) | set(snapshot)
+                  if snapshot.get(member_id, 0) != replayed.get(member_id, 0)]
+    if not afvigelser:
+        await ctx.send(f"✅ Point ledgeren stemmer med stats tabellen for {len(snapshot)} members.")
+        return
+    
+    result_text = "```\n"
+    for member_id, stats_points, ledger_points in afvigelser[:15]:
+        result_text += f"{role_index.name(member_id)[:20].ljust(20)} stats {stats_points:4d} / ledger {ledger_points:4d}\n"
+    result_text += "```"
+    await ctx.send(f"⚠️ {len(afvigelser)} members afviger mellem stats tabellen og ledgeren:\n{result_text}")
+
 @bot.command()
 async def admin_reset(ctx):
     """Reset alle jobs (kun til admin)"""
@@ -2521,17 +2490,9 @@ async def admin_reset(ctx):
         return
     
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Clear all tables except permanent_jobs
-        cursor.execute("DELETE FROM member_jobs")
-        cursor.execute("DELETE FROM completed_jobs")
-        cursor.execute("DELETE FROM prospect_supporter_stats")
-        cursor.execute("UPDATE settings SET value = '1' WHERE key = 'job_counter'")
-        
-        conn.commit()
-        conn.close()
+        await job_store.reset_jobs_and_stats()
+        leaderboards.clear()
         
         # Opdater kanaler
         await setup_prospect_supporter_kanal()
@@ -2548,10 +2509,8 @@ async def admin_reset(ctx):
 async def periodic_stats_check():
     """Periodisk tjek af prospect_supporter stats og markbetalinger som backup til events"""
     try:
-        stats_kanal = bot.get_channel(STATUS_KANAL_ID)
-        if stats_kanal:
-            # Stille opdatering uden at spamme logs
-            await update_prospect_supporter_stats_embed(stats_kanal)
+        # Stille opdatering uden at spamme logs
+        refresh_scheduler.mark_dirty("stats")
         
         # Disabled: Markbetalinger
         # markbetalinger_kanal = bot.get_channel(MARKBETALINGS_KANAL_ID)
@@ -2559,6 +2518,15 @@ async def periodic_stats_check():
         #     await update_markbetalinger_embed(markbetalinger_kanal)
         
         print("🔄 Periodisk stats og markbetalinger check udført")
+        for line in outbound.format_stats():
+            print(f"   📤 {line}")
+        print(f"   🏊 {channel_pool.format_stats()}")
+        print(f"   👤 {member_resolver.format_stats()}")
+        print(f"   🧮 {point_ledger.format_stats()}")
+        print(f"   🗄️ {job_archive.format_stats()}")
+        claims = job_store.claim_stats
+        print(f"   🎯 Job claims: {claims['attempts']} forsøg, {claims['wins']} vundet, "
+              f"{claims['conflicts']} konflikter, {claims['errors']} fejl")
     except Exception as e:
         print(f"Fejl ved periodisk check: {e}")
 
@@ -2566,5 +2534,27 @@ async def periodic_stats_check():
 async def before_periodic_check():
     await bot.wait_until_ready()
 
-bot.run(TOKEN)
+async def shutdown():
+    """Skriv ventende point til ledgeren og luk databasen - kører når botten lukker"""
+    try:
+        await point_ledger.flush()
+    except Exception as e:
+        print(f"❌ Kunne ikke skrive ventende point ved nedlukning: {e}")
+    await db.close()
+
+async def main():
+    discord.utils.setup_logging()
+    loop = asyncio.get_running_loop()
+    try:
+        # SIGTERM (f.eks. container stop) lukker botten pænt, så point bufferen når at blive skrevet
+        loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+    except NotImplementedError:
+        pass
+    try:
+        async with bot:
+            await bot.start(TOKEN)
+    finally:
+        await shutdown()
+
+asyncio.run(main())
 
@@ -0,0 +1,97 @@
+import asyncio
+from collections import defaultdict
+
+
+class RefreshScheduler:
+    """Koalescerende, single-flight scheduler for kanal opdateringer.
+
+    Kaldere markerer blot et target (f.eks. "board", "stats" eller en privat
+    kanal) som dirty. Én worker per target venter et kort debounce vindue,
+    så alle ændringer i vinduet samles i én render, og der kører aldrig to
+    renders af samme target på én gang. Midlertidige targets (render givet
+    til mark_dirty) glemmes igen når deres worker er færdig, og deres stats
+    lægges sammen under præfikset før ":" (f.eks. "privat").
+
+    En render kan returnere False for at sige at den ikke kørte (f.eks. droppet
+    som forældet) - ventende flush kaldere venter så på den næste render.
+    """
+
+    def __init__(self, debounce=1.0):
+        self.debounce = debounce
+        self._renderers = {}
+        self._transient = set()
+        self._pending = set()
+        self._workers = {}
+        self._waiters = defaultdict(list)
+        self.stats = defaultdict(lambda: {"marks": 0, "renders": 0, "skipped": 0, "errors": 0})
+
+    def register(self, key, render):
+        """Registrer render coroutine funktionen for et fast target"""
+        self._renderers[key] = render
+
+    def mark_dirty(self, key, render=None):
+        """Marker target som dirty - render sker i baggrunden efter debounce"""
+        if render is not None:
+            self._renderers[key] = render
+            self._transient.add(key)
+        if key not in self._renderers:
+            raise KeyError(f"Ukendt refresh target: {key}")
+
+        self.stats[key]["marks"] += 1
+        self._pending.add(key)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._run(key))
+
+    async def flush(self, key, render=None):
+        """Marker target som dirty og vent til en render der dækker markeringen er færdig"""
+        self.mark_dirty(key, render)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[key].append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._waiters.get(key, ()):
+                self._waiters[key].remove(waiter)
+
+    def is_rendering(self, key):
+        return key in self._workers
+
+    def is_pending(self, key):
+        """Sand hvis target er markeret dirty igen og en ny render allerede er på vej"""
+        return key in self._pending
+
+    async def _run(self, key):
+        try:
+            while key in self._pending:
+                await asyncio.sleep(self.debounce)
+                self._pending.discard(key)
+                waiters = self._waiters.pop(key, [])
+                try:
+                    ran = await self._renderers[key]() is not False
+                    self.stats[key]["renders" if ran else "skipped"] += 1
+                except Exception as e:
+                    self.stats[key]["errors"] += 1
+                    print(f"Fejl ved refresh af {key}: {e}")
+                    ran = True  # Fejlen er logget - ventende kaldere skal ikke hænge
+
+                if not ran and key in self._pending:
+                    # Renderen blev droppet fordi target er dirty igen - den næste render dækker dem
+                    self._waiters[key][:0] = waiters
+                    continue
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            self._workers.pop(key, None)
+            if key in self._transient and key not in self._pending:
+                self._forget(key)
+
+    def _forget(self, key):
+        """Fjern et midlertidigt target og fold dets stats ind i præfikset"""
+        self._transient.discard(key)
+        self._renderers.pop(key, None)
+        stats = self.stats.pop(key, None)
+        if stats:
+            total = self.stats[key.split(":")[0]]
+            for name, value in stats.items():
+                total[name] += value
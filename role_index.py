@@ -0,0 +1,68 @@
+class RoleIndex:
+    """Inkrementelt vedligeholdt indeks over hvem der har de roller botten bruger.
+
+    Bygges én gang ved opstart ud fra member cachen og holdes derefter
+    opdateret fra on_member_update, on_member_join og on_member_remove, så
+    "hvem har rolle X lige nu" er et O(1) opslag i stedet for role.members.
+    """
+
+    def __init__(self, tracked_role_ids):
+        self.tracked_role_ids = frozenset(tracked_role_ids)
+        self._members = {role_id: set() for role_id in self.tracked_role_ids}
+        self._roles = {}  # member_id -> frozenset af sporede rolle IDs
+        self._names = {}  # member_id -> display_name
+        self.built = False
+
+    def build(self, members):
+        """Byg indekset fra bunden ud fra en iterable af members"""
+        for role_members in self._members.values():
+            role_members.clear()
+        self._roles.clear()
+        self._names.clear()
+        for member in members:
+            self.update_member(member)
+        self.built = True
+
+    def update_member(self, member):
+        """Opdater et members roller og navn - returnerer de sporede roller der ændrede sig"""
+        new_roles = frozenset(role.id for role in member.roles) & self.tracked_role_ids
+        return self.set_member_roles(member.id, new_roles, member.display_name)
+
+    def set_member_roles(self, member_id, role_ids, display_name=None):
+        """Sæt de sporede roller for et member ID - returnerer de roller der ændrede sig"""
+        new_roles = frozenset(role_ids) & self.tracked_role_ids
+        old_roles = self._roles.get(member_id, frozenset())
+
+        for role_id in old_roles - new_roles:
+            self._members[role_id].discard(member_id)
+        for role_id in new_roles - old_roles:
+            self._members[role_id].add(member_id)
+
+        if new_roles:
+            self._roles[member_id] = new_roles
+            if display_name is not None:
+                self._names[member_id] = display_name
+        else:
+            self._roles.pop(member_id, None)
+            self._names.pop(member_id, None)
+        return old_roles ^ new_roles
+
+    def remove_member(self, member_id):
+        """Fjern et member helt (forlod serveren) - returnerer de roller det havde"""
+        return self.set_member_roles(member_id, ())
+
+    def members(self, role_id):
+        """Sæt af member IDs med rollen - må ikke ændres af kalderen"""
+        return self._members.get(role_id, set())
+
+    def members_with_any(self, role_ids):
+        result = set()
+        for role_id in role_ids:
+            result |= self.members(role_id)
+        return result
+
+    def has_role(self, member_id, role_id):
+        return member_id in self.members(role_id)
+
+    def name(self, member_id, default="Ukendt"):
+        return self._names.get(member_id, default)